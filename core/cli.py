@@ -1,24 +1,151 @@
+import atexit
 import click
 import asyncio
-import json
+import orjson
 import os
+import re
+import sys
+from functools import cached_property
 from pathlib import Path
-from colorama import init, Fore, Style
+from colorama import init
 
-from .runner import BotRunner
-from .monitor import BotMonitor
-from .scheduler import BotScheduler
-from utils.validator import TokenValidator
 from utils.logger import setup_logging
 
-init(autoreset=True)
+# Constant-folded ANSI escapes: colorama attribute lookups per f-string add
+# up across per-row echoes, and piped output should carry no escapes at all
+if sys.stdout.isatty():
+    init(autoreset=True)
+    GREEN, RED, CYAN, YELLOW, RESET = (
+        '\x1b[32m', '\x1b[31m', '\x1b[36m', '\x1b[33m', '\x1b[0m'
+    )
+else:
+    GREEN = RED = CYAN = YELLOW = RESET = ''
+
+BOTS_DIR = Path('bots')
+
+# Same grammar BotScheduler._parse_schedule_time accepts ("30m", "2h",
+# "2.5h", "1d"); compiled once so bad input is rejected before the
+# scheduler is even constructed
+_SCHED_RE = re.compile(r'^\d+(?:\.\d+)?[hmd]$', re.IGNORECASE)
 
 class NitrixContext:
-    def __init__(self):
-        self.runner = BotRunner()
-        self.monitor = BotMonitor()
-        self.scheduler = BotScheduler()
-        self.validator = TokenValidator()
+    """Lazily constructs the heavy subsystems so cheap commands stay cheap.
+
+    Importing runner/monitor pulls in docker and watchdog; commands
+    like `version` or `logs` never need them, so each component is imported
+    and instantiated on first access only.
+    """
+
+    @cached_property
+    def loop(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        atexit.register(self._close_loop, loop)
+        return loop
+
+    def run(self, coro):
+        """Run a coroutine on the shared event loop.
+
+        A single loop is reused for every async call in a CLI invocation,
+        avoiding the loop/executor setup+teardown that asyncio.run pays
+        per call.
+        """
+        return self.loop.run_until_complete(coro)
+
+    def _close_loop(self, loop):
+        try:
+            # Shut down shared HTTP sessions before tearing the loop down
+            runner = self.__dict__.get('runner')
+            for client in (self.__dict__.get('validator'),
+                           getattr(runner, 'validator', None),
+                           getattr(runner, 'webhook', None)):
+                if client is not None:
+                    loop.run_until_complete(client.aclose())
+
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(
+                    asyncio.gather(*pending, return_exceptions=True)
+                )
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+    @cached_property
+    def runner(self):
+        from .runner import BotRunner
+        return BotRunner()
+
+    @cached_property
+    def monitor(self):
+        from .monitor import BotMonitor
+        return BotMonitor()
+
+    @cached_property
+    def scheduler(self):
+        from .scheduler import BotScheduler
+        return BotScheduler()
+
+    @cached_property
+    def validator(self):
+        from utils.validator import TokenValidator
+        return TokenValidator()
+
+def _tail_n(path, n):
+    """Return the last n lines of a file without reading it whole.
+
+    Seeks backwards from the end in growing blocks until enough newlines
+    are found, so a multi-hundred-MB log costs kilobytes of I/O instead of
+    a full read into memory.
+    """
+    if n <= 0:
+        return []
+
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        block = 8192
+        data = b''
+        pos = file_size
+
+        while pos > 0 and data.count(b'\n') <= n:
+            read_size = min(block, pos)
+            pos -= read_size
+            f.seek(pos)
+            data = f.read(read_size) + data
+            block *= 2
+
+    lines = data.splitlines()
+    return [line.decode('utf-8', errors='replace') for line in lines[-n:]]
+
+def _remove_bot_dir(bot_dir):
+    """Delete a bot directory, removing its subtrees in parallel.
+
+    A bot checkout's .git/objects can hold thousands of pack files;
+    deleting top-level subdirectories on a small thread pool overlaps the
+    blocking unlink syscalls instead of walking everything serially.
+    """
+    import shutil
+    from concurrent.futures import ThreadPoolExecutor
+
+    subdirs = []
+    files = []
+    with os.scandir(bot_dir) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            else:
+                files.append(entry.path)
+
+    if subdirs:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(shutil.rmtree, subdirs))
+
+    for path in files:
+        os.unlink(path)
+    os.rmdir(bot_dir)
 
 @click.group()
 @click.pass_context
@@ -36,13 +163,13 @@ def cli(ctx):
 def start(obj, bot_name, config, env):
     """Start a Discord bot"""
     try:
-        result = asyncio.run(obj.runner.start_bot(bot_name, config, env))
+        result = obj.run(obj.runner.start_bot(bot_name, config, env))
         if result:
-            click.echo(f"{Fore.GREEN}✅ Bot '{bot_name}' started successfully")
+            click.echo(f"{GREEN}✅ Bot '{bot_name}' started successfully")
         else:
-            click.echo(f"{Fore.RED}❌ Failed to start bot '{bot_name}'")
+            click.echo(f"{RED}❌ Failed to start bot '{bot_name}'")
     except Exception as e:
-        click.echo(f"{Fore.RED}❌ Error: {e}")
+        click.echo(f"{RED}❌ Error: {e}")
 
 @cli.command()
 @click.argument('bot_name')
@@ -50,13 +177,13 @@ def start(obj, bot_name, config, env):
 def stop(obj, bot_name):
     """Stop a Discord bot"""
     try:
-        result = asyncio.run(obj.runner.stop_bot(bot_name))
+        result = obj.run(obj.runner.stop_bot(bot_name))
         if result:
-            click.echo(f"{Fore.YELLOW}⏹️  Bot '{bot_name}' stopped")
+            click.echo(f"{YELLOW}⏹️  Bot '{bot_name}' stopped")
         else:
-            click.echo(f"{Fore.RED}❌ Bot '{bot_name}' not found or already stopped")
+            click.echo(f"{RED}❌ Bot '{bot_name}' not found or already stopped")
     except Exception as e:
-        click.echo(f"{Fore.RED}❌ Error: {e}")
+        click.echo(f"{RED}❌ Error: {e}")
 
 @cli.command()
 @click.argument('bot_name')
@@ -64,32 +191,32 @@ def stop(obj, bot_name):
 def restart(obj, bot_name):
     """Restart a Discord bot"""
     try:
-        result = asyncio.run(obj.runner.restart_bot(bot_name))
+        result = obj.run(obj.runner.restart_bot(bot_name))
         if result:
-            click.echo(f"{Fore.CYAN}🔄 Bot '{bot_name}' restarted")
+            click.echo(f"{CYAN}🔄 Bot '{bot_name}' restarted")
         else:
-            click.echo(f"{Fore.RED}❌ Failed to restart bot '{bot_name}'")
+            click.echo(f"{RED}❌ Failed to restart bot '{bot_name}'")
     except Exception as e:
-        click.echo(f"{Fore.RED}❌ Error: {e}")
+        click.echo(f"{RED}❌ Error: {e}")
 
 @cli.command()
 @click.pass_obj
 def status(obj):
     """Show status of all bots"""
     try:
-        bots = asyncio.run(obj.runner.list_bots())
+        bots = obj.run(obj.runner.list_bots())
         if not bots:
-            click.echo(f"{Fore.YELLOW}📭 No bots are currently running")
+            click.echo(f"{YELLOW}📭 No bots are currently running")
             return
         
-        click.echo(f"{Fore.CYAN}📊 Bot Status:")
+        click.echo(f"{CYAN}📊 Bot Status:")
         click.echo("-" * 60)
         for bot in bots:
-            status_color = Fore.GREEN if bot['status'] == 'running' else Fore.RED
+            status_color = GREEN if bot['status'] == 'running' else RED
             uptime = bot.get('uptime', 'N/A')
             click.echo(f"{status_color}{bot['name']:<20} {bot['status']:<10} {uptime}")
     except Exception as e:
-        click.echo(f"{Fore.RED}❌ Error: {e}")
+        click.echo(f"{RED}❌ Error: {e}")
 
 @cli.command()
 @click.argument('bot_name')
@@ -99,20 +226,18 @@ def status(obj):
 def logs(obj, bot_name, lines, follow):
     """Show bot logs"""
     try:
-        log_file = Path(f"bots/{bot_name}/logs/bot.log")
+        log_file = BOTS_DIR.joinpath(bot_name, 'logs', 'bot.log')
         if not log_file.exists():
-            click.echo(f"{Fore.RED}❌ No logs found for bot '{bot_name}'")
+            click.echo(f"{RED}❌ No logs found for bot '{bot_name}'")
             return
         
         if follow:
-            asyncio.run(obj.monitor.tail_logs(bot_name))
+            obj.run(obj.monitor.tail_logs(bot_name))
         else:
-            with open(log_file, 'r') as f:
-                log_lines = f.readlines()
-                for line in log_lines[-lines:]:
-                    click.echo(line.strip())
+            for line in _tail_n(log_file, lines):
+                click.echo(line.strip())
     except Exception as e:
-        click.echo(f"{Fore.RED}❌ Error: {e}")
+        click.echo(f"{RED}❌ Error: {e}")
 
 @cli.command()
 @click.argument('bot_name')
@@ -121,13 +246,17 @@ def logs(obj, bot_name, lines, follow):
 def schedule(obj, bot_name, schedule_time):
     """Schedule automatic restart for a bot"""
     try:
+        if not _SCHED_RE.match(schedule_time.strip()):
+            click.echo(f"{RED}❌ Invalid schedule format '{schedule_time}' (use e.g. 30m, 2h, 1d)")
+            return
+
         result = obj.scheduler.add_schedule(bot_name, schedule_time)
         if result:
-            click.echo(f"{Fore.GREEN}⏰ Scheduled restart for '{bot_name}' every {schedule_time}")
+            click.echo(f"{GREEN}⏰ Scheduled restart for '{bot_name}' every {schedule_time}")
         else:
-            click.echo(f"{Fore.RED}❌ Failed to schedule restart for '{bot_name}'")
+            click.echo(f"{RED}❌ Failed to schedule restart for '{bot_name}'")
     except Exception as e:
-        click.echo(f"{Fore.RED}❌ Error: {e}")
+        click.echo(f"{RED}❌ Error: {e}")
 
 @cli.command()
 @click.argument('bot_name')
@@ -137,11 +266,11 @@ def unschedule(obj, bot_name):
     try:
         result = obj.scheduler.remove_schedule(bot_name)
         if result:
-            click.echo(f"{Fore.YELLOW}⏰ Removed schedule for '{bot_name}'")
+            click.echo(f"{YELLOW}⏰ Removed schedule for '{bot_name}'")
         else:
-            click.echo(f"{Fore.RED}❌ No schedule found for '{bot_name}'")
+            click.echo(f"{RED}❌ No schedule found for '{bot_name}'")
     except Exception as e:
-        click.echo(f"{Fore.RED}❌ Error: {e}")
+        click.echo(f"{RED}❌ Error: {e}")
 
 @cli.command()
 @click.argument('bot_name')
@@ -150,13 +279,13 @@ def unschedule(obj, bot_name):
 def validate(obj, bot_name, token):
     """Validate bot token"""
     try:
-        result = asyncio.run(obj.validator.validate_token(token))
+        result = obj.run(obj.validator.validate_token(token))
         if result:
-            click.echo(f"{Fore.GREEN}✅ Token is valid for bot '{bot_name}'")
+            click.echo(f"{GREEN}✅ Token is valid for bot '{bot_name}'")
         else:
-            click.echo(f"{Fore.RED}❌ Invalid token for bot '{bot_name}'")
+            click.echo(f"{RED}❌ Invalid token for bot '{bot_name}'")
     except Exception as e:
-        click.echo(f"{Fore.RED}❌ Error: {e}")
+        click.echo(f"{RED}❌ Error: {e}")
 
 @cli.command()
 @click.argument('bot_name')
@@ -166,7 +295,7 @@ def validate(obj, bot_name, token):
 def add(obj, bot_name, dockerfile, env_file):
     """Add a new bot configuration"""
     try:
-        bot_dir = Path(f"bots/{bot_name}")
+        bot_dir = BOTS_DIR / bot_name
         bot_dir.mkdir(parents=True, exist_ok=True)
         
         config = {
@@ -181,8 +310,8 @@ def add(obj, bot_name, dockerfile, env_file):
         }
         
         config_file = bot_dir / "config.json"
-        with open(config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        with open(config_file, 'wb') as f:
+            f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
         
         dockerfile_path = bot_dir / dockerfile
         if not dockerfile_path.exists():
@@ -201,12 +330,12 @@ CMD ["python", "main.py"]
             with open(env_path, 'w') as f:
                 f.write("BOT_TOKEN=your_bot_token_here\n")
         
-        click.echo(f"{Fore.GREEN}✅ Bot '{bot_name}' configuration created")
+        click.echo(f"{GREEN}✅ Bot '{bot_name}' configuration created")
         click.echo(f"📁 Directory: {bot_dir}")
         click.echo(f"⚠️  Don't forget to update the env file with your bot token!")
         
     except Exception as e:
-        click.echo(f"{Fore.RED}❌ Error: {e}")
+        click.echo(f"{RED}❌ Error: {e}")
 
 @cli.command()
 @click.argument('bot_name')
@@ -214,33 +343,53 @@ CMD ["python", "main.py"]
 def remove(obj, bot_name):
     """Remove a bot configuration"""
     try:
-        result = asyncio.run(obj.runner.stop_bot(bot_name))
+        result = obj.run(obj.runner.stop_bot(bot_name))
         
-        bot_dir = Path(f"bots/{bot_name}")
+        bot_dir = BOTS_DIR / bot_name
         if bot_dir.exists():
-            import shutil
-            shutil.rmtree(bot_dir)
-            click.echo(f"{Fore.YELLOW}🗑️  Bot '{bot_name}' removed")
+            _remove_bot_dir(bot_dir)
+            click.echo(f"{YELLOW}🗑️  Bot '{bot_name}' removed")
         else:
-            click.echo(f"{Fore.RED}❌ Bot '{bot_name}' not found")
+            click.echo(f"{RED}❌ Bot '{bot_name}' not found")
     except Exception as e:
-        click.echo(f"{Fore.RED}❌ Error: {e}")
+        click.echo(f"{RED}❌ Error: {e}")
 
 @cli.command()
 @click.pass_obj
 def monitor(obj):
     """Start monitoring mode (runs in background)"""
     try:
-        click.echo(f"{Fore.CYAN}👁️  Starting t10 monitor...")
-        asyncio.run(obj.monitor.start_monitoring())
+        click.echo(f"{CYAN}👁️  Starting t10 monitor...")
+        obj.run(obj.monitor.start_monitoring())
     except KeyboardInterrupt:
-        click.echo(f"{Fore.YELLOW}⏹️  Monitor stopped")
+        click.echo(f"{YELLOW}⏹️  Monitor stopped")
     except Exception as e:
-        click.echo(f"{Fore.RED}❌ Error: {e}")
+        click.echo(f"{RED}❌ Error: {e}")
 
 @cli.command()
 @click.pass_obj
 def version(obj):
     """Show t10 version"""
-    click.echo(f"{Fore.CYAN}t10 v1.0.0 - Discord Bot Manager")
-    click.echo(f"{Fore.GREEN}Built with ❤️  by Nitrix")
+    click.echo(f"{CYAN}t10 v1.0.0 - Discord Bot Manager")
+    click.echo(f"{GREEN}Built with ❤️  by Nitrix")
+
+def main(argv=None):
+    """Entry point that fast-paths exact subcommand matches.
+
+    Click's group dispatch re-walks the command map and re-parses group
+    options on every invocation; when argv names a known subcommand we
+    hand the remaining arguments straight to that command instead.
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+
+    if argv and not argv[0].startswith('-'):
+        command = cli.commands.get(argv[0])
+        if command is not None:
+            setup_logging()
+            return command.main(
+                argv[1:],
+                prog_name=f"t10 {argv[0]}",
+                obj=NitrixContext()
+            )
+
+    return cli(argv)
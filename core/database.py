@@ -0,0 +1,241 @@
+import atexit
+import json
+import sqlite3
+
+import orjson
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.logger import get_logger
+
+class BotDatabase:
+    """SQLite-backed store for bot state.
+
+    WAL journaling lets the monitor daemon and CLI processes read and
+    write concurrently, and the primary key on name turns lookups into
+    index probes instead of TinyDB's full-file scan and rewrite-on-update.
+    """
+
+    _FIELDS = ('status', 'config', 'started_at', 'stopped_at',
+               'crashed_at', 'exit_code', 'nitrix_managed')
+    _SCHEDULE_FIELDS = ('schedule_time', 'interval_minutes', 'created_at',
+                        'last_run', 'next_run_ts', 'nitrix_managed')
+
+    def __init__(self, db_path: str = 'data/t10.sqlite'):
+        self.logger = get_logger('database')
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, isolation_level=None,
+                                     check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS bots (
+                    name TEXT PRIMARY KEY,
+                    status TEXT,
+                    config TEXT,
+                    started_at REAL,
+                    stopped_at REAL,
+                    crashed_at REAL,
+                    exit_code INTEGER,
+                    nitrix_managed INTEGER DEFAULT 1
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS schedules (
+                    bot_name TEXT PRIMARY KEY,
+                    schedule_time TEXT,
+                    interval_minutes REAL,
+                    created_at REAL,
+                    last_run REAL,
+                    next_run_ts REAL,
+                    nitrix_managed INTEGER DEFAULT 1
+                )
+            """)
+
+        self._import_legacy_tinydb(Path(db_path).parent / 't10.db')
+        atexit.register(self.close)
+
+    def all_bots(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT name, status, config, started_at, stopped_at, '
+                'crashed_at, exit_code, nitrix_managed FROM bots'
+            ).fetchall()
+        return [self._row_to_record(row) for row in rows]
+
+    def get_bot(self, bot_name: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT name, status, config, started_at, stopped_at, '
+                'crashed_at, exit_code, nitrix_managed FROM bots WHERE name = ?',
+                (bot_name,)
+            ).fetchone()
+        return self._row_to_record(row) if row else None
+
+    def bots_with_status(self, status: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT name, status, config, started_at, stopped_at, '
+                'crashed_at, exit_code, nitrix_managed FROM bots WHERE status = ?',
+                (status,)
+            ).fetchall()
+        return [self._row_to_record(row) for row in rows]
+
+    def upsert_bot(self, bot_name: str, fields: Dict):
+        fields = {k: v for k, v in fields.items() if k in self._FIELDS}
+        if not fields:
+            return
+
+        if 'config' in fields and fields['config'] is not None:
+            fields = dict(fields, config=orjson.dumps(fields['config']).decode())
+        if 'nitrix_managed' in fields:
+            fields = dict(fields, nitrix_managed=int(bool(fields['nitrix_managed'])))
+
+        columns = list(fields)
+        assignments = ', '.join(f'{col} = excluded.{col}' for col in columns)
+        sql = (
+            f"INSERT INTO bots (name, {', '.join(columns)}) "
+            f"VALUES (?{', ?' * len(columns)}) "
+            f"ON CONFLICT(name) DO UPDATE SET {assignments}"
+        )
+
+        with self._lock:
+            self._conn.execute(sql, (bot_name, *fields.values()))
+
+    def update_bot(self, bot_name: str, fields: Dict) -> bool:
+        """Update an existing bot record; no-op if the bot is unknown."""
+        fields = {k: v for k, v in fields.items() if k in self._FIELDS}
+        if not fields:
+            return False
+
+        if 'config' in fields and fields['config'] is not None:
+            fields = dict(fields, config=orjson.dumps(fields['config']).decode())
+        if 'nitrix_managed' in fields:
+            fields = dict(fields, nitrix_managed=int(bool(fields['nitrix_managed'])))
+
+        assignments = ', '.join(f'{col} = ?' for col in fields)
+        with self._lock:
+            cursor = self._conn.execute(
+                f'UPDATE bots SET {assignments} WHERE name = ?',
+                (*fields.values(), bot_name)
+            )
+        return cursor.rowcount > 0
+
+    def remove_bot(self, bot_name: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                'DELETE FROM bots WHERE name = ?', (bot_name,)
+            )
+        return cursor.rowcount > 0
+
+    def all_schedules(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT bot_name, schedule_time, interval_minutes, '
+                'created_at, last_run, next_run_ts, nitrix_managed FROM schedules'
+            ).fetchall()
+        return [self._row_to_schedule(row) for row in rows]
+
+    def get_schedule(self, bot_name: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT bot_name, schedule_time, interval_minutes, '
+                'created_at, last_run, next_run_ts, nitrix_managed FROM schedules '
+                'WHERE bot_name = ?',
+                (bot_name,)
+            ).fetchone()
+        return self._row_to_schedule(row) if row else None
+
+    def upsert_schedule(self, bot_name: str, fields: Dict):
+        fields = {k: v for k, v in fields.items() if k in self._SCHEDULE_FIELDS}
+        if not fields:
+            return
+
+        if 'nitrix_managed' in fields:
+            fields = dict(fields, nitrix_managed=int(bool(fields['nitrix_managed'])))
+
+        columns = list(fields)
+        assignments = ', '.join(f'{col} = excluded.{col}' for col in columns)
+        sql = (
+            f"INSERT INTO schedules (bot_name, {', '.join(columns)}) "
+            f"VALUES (?{', ?' * len(columns)}) "
+            f"ON CONFLICT(bot_name) DO UPDATE SET {assignments}"
+        )
+
+        with self._lock:
+            self._conn.execute(sql, (bot_name, *fields.values()))
+
+    def remove_schedule(self, bot_name: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                'DELETE FROM schedules WHERE bot_name = ?', (bot_name,)
+            )
+        return cursor.rowcount > 0
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.ProgrammingError:
+                pass  # already closed
+
+    def _row_to_record(self, row) -> Dict:
+        record = {
+            'name': row[0],
+            'status': row[1],
+            'config': orjson.loads(row[2]) if row[2] else {},
+            'started_at': row[3],
+            'stopped_at': row[4],
+            'crashed_at': row[5],
+            'exit_code': row[6],
+            'nitrix_managed': bool(row[7])
+        }
+        return record
+
+    def _row_to_schedule(self, row) -> Dict:
+        return {
+            'bot_name': row[0],
+            'schedule_time': row[1],
+            'interval_minutes': row[2],
+            'created_at': row[3],
+            'last_run': row[4],
+            'next_run_ts': row[5],
+            'nitrix_managed': bool(row[6])
+        }
+
+    def _import_legacy_tinydb(self, legacy_path: Path):
+        """One-time import of records from the old TinyDB JSON file."""
+        try:
+            if not legacy_path.exists():
+                return
+
+            with self._lock:
+                count = self._conn.execute(
+                    'SELECT (SELECT COUNT(*) FROM bots) + '
+                    '(SELECT COUNT(*) FROM schedules)'
+                ).fetchone()[0]
+            if count:
+                return
+
+            with open(legacy_path, 'r') as f:
+                legacy = json.load(f)
+
+            for record in legacy.get('bots', {}).values():
+                name = record.get('name')
+                if name:
+                    self.upsert_bot(name, record)
+                    self.logger.info(f"Imported legacy record for {name}")
+
+            for record in legacy.get('schedules', {}).values():
+                bot_name = record.get('bot_name')
+                if bot_name:
+                    self.upsert_schedule(bot_name, record)
+                    self.logger.info(f"Imported legacy schedule for {bot_name}")
+
+        except Exception as e:
+            self.logger.error(f"Legacy database import failed: {e}")
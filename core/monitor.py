@@ -1,45 +1,241 @@
 import asyncio
+import os
+import sys
 import time
-import json
+import orjson
 from pathlib import Path
 from typing import Dict, List
 import docker
-from tinydb import TinyDB, Query
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import FileSystemEventHandler, PatternMatchingEventHandler
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None  # optional; git updates fall back to subprocess git
 
 from utils.logger import get_logger
 from utils.webhook import WebhookNotifier
+from .database import BotDatabase
+from .scheduler import BotScheduler
+
+BOTS_DIR = Path('bots')
+
+class GitWatcher(PatternMatchingEventHandler):
+    """Shared handler dispatching HEAD changes in watched bot repos.
+
+    One handler serves every bot: each `.git` directory is watched
+    non-recursively for HEAD only, so the observer never sees the object/
+    pack-file firehose a pull generates, and dispatch is a dict lookup.
+    """
 
-class GitWatcher(FileSystemEventHandler):
     def __init__(self, monitor):
+        super().__init__(patterns=['*/HEAD'], ignore_directories=True)
         self.monitor = monitor
         self.logger = get_logger('git_watcher')
+        self.bot_names = {}  # .git directory path -> bot name
+        self.last_fired = {}  # bot name -> monotonic time of last dispatch
+
+    DEBOUNCE_SECONDS = 2.0
+
+    def add_repo(self, git_dir: Path, bot_name: str):
+        self.bot_names[str(git_dir)] = bot_name
 
     def on_modified(self, event):
-        if event.is_directory or not event.src_path.endswith('.git/HEAD'):
+        bot_name = self.bot_names.get(str(Path(event.src_path).parent))
+        if bot_name is None:
             return
-        
-        bot_name = Path(event.src_path).parent.parent.name
-        asyncio.create_task(self.monitor.handle_git_update(bot_name))
+
+        # A single pull rewrites HEAD several times; collapse the burst
+        now = time.monotonic()
+        if now - self.last_fired.get(bot_name, 0.0) < self.DEBOUNCE_SECONDS:
+            return
+        self.last_fired[bot_name] = now
+
+        # This callback runs on the observer thread, which has no running
+        # event loop; hand the coroutine to the monitor's loop instead
+        loop = self.monitor.loop
+        if loop is None:
+            self.logger.warning(f"Monitor loop not running, dropping git update for {bot_name}")
+            return
+        loop.call_soon_threadsafe(
+            loop.create_task, self.monitor.handle_git_update(bot_name)
+        )
+
+class BotStateCache:
+    """Write-through cache over the bot database.
+
+    Crash handling can touch several records per tick, so updates are
+    coalesced in memory and flushed off-loop after a short debounce.
+    Reads are served from the cache, which is refreshed from disk on a
+    short TTL to pick up changes made by the CLI process.
+    """
+
+    FLUSH_DELAY = 2.0
+    RELOAD_INTERVAL = 30.0
+
+    def __init__(self, db):
+        self.db = db
+        self._records = {}
+        self._dirty = set()
+        self._flush_task = None
+        self._loaded_at = 0.0
+
+    def _maybe_reload(self):
+        if time.time() - self._loaded_at < self.RELOAD_INTERVAL:
+            return
+        fresh = {r['name']: dict(r) for r in self.db.all_bots()}
+        # Keep unflushed local updates over what is on disk
+        for name in self._dirty:
+            if name in self._records:
+                fresh[name] = self._records[name]
+        self._records = fresh
+        self._loaded_at = time.time()
+
+    def get(self, bot_name):
+        self._maybe_reload()
+        record = self._records.get(bot_name)
+        return dict(record) if record else None
+
+    def running_bots(self):
+        self._maybe_reload()
+        return [dict(r) for r in self._records.values()
+                if r.get('status') == 'running']
+
+    def update(self, bot_name, fields):
+        self._maybe_reload()
+        record = self._records.setdefault(bot_name, {'name': bot_name})
+        record.update(fields)
+        self._dirty.add(bot_name)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    def absorb(self, bot_name, fields):
+        """Mirror a change another writer already persisted.
+
+        Keeps reads current without marking the record dirty, so the
+        next flush does not rewrite fields this process never changed.
+        """
+        record = self._records.setdefault(bot_name, {'name': bot_name})
+        record.update(fields)
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(self.FLUSH_DELAY)
+        await self.flush()
+
+    async def flush(self):
+        dirty, self._dirty = self._dirty, set()
+        if not dirty:
+            return
+        records = {name: dict(self._records[name]) for name in dirty}
+        await asyncio.to_thread(self._write_back, records)
+
+    def _write_back(self, records):
+        for name, record in records.items():
+            self.db.upsert_bot(name, record)
+
+class _LogTailHandler(FileSystemEventHandler):
+    """Signals the tail_logs coroutine when the watched log file changes."""
+
+    def __init__(self, log_file, loop, events):
+        self.log_file = str(log_file)
+        self.loop = loop
+        self.events = events
+
+    def _notify(self, kind):
+        # Watchdog callbacks run on the observer thread
+        self.loop.call_soon_threadsafe(self.events.put_nowait, kind)
+
+    def on_modified(self, event):
+        if event.src_path == self.log_file:
+            self._notify('modified')
+
+    def on_created(self, event):
+        if event.src_path == self.log_file:
+            self._notify('modified')
+
+    def on_moved(self, event):
+        if event.src_path == self.log_file:
+            self._notify('rotated')
+
+    def on_deleted(self, event):
+        if event.src_path == self.log_file:
+            self._notify('rotated')
 
 class BotMonitor:
     def __init__(self):
-        self.db = TinyDB('data/t10.db')
-        self.bots_table = self.db.table('bots')
+        self.db = BotDatabase()
+        self.bot_state = BotStateCache(self.db)
         self.logger = get_logger('monitor')
         self.docker_client = docker.from_env()
         self.webhook = WebhookNotifier()
         self.running = False
         self.nitrix_monitor_active = False
-        
+        self._container_snapshot = []
+        self._snapshot_taken_at = 0.0
+        self._repos = {}  # bot name -> open pygit2 repository
+        self._config_cache = {}  # config path -> (st_mtime_ns, parsed dict)
+        self._start_epoch = {}  # container id -> (StartedAt string, epoch)
+        self._runner = None
+        self.scheduler = None
+        self.loop = None
+
+    @property
+    def runner(self):
+        """Single BotRunner shared by all monitor callbacks.
+
+        Imported lazily to avoid the runner<->monitor circular import;
+        constructing one per crash event rebuilt the Docker client and
+        logger wiring every time.
+        """
+        if self._runner is None:
+            from .runner import BotRunner
+            self._runner = BotRunner()
+        return self._runner
+
+    def _load_config(self, config_file: Path) -> Dict:
+        """Parse a bot config, reusing the result while the file is unchanged."""
+        stat = config_file.stat()
+        cached = self._config_cache.get(str(config_file))
+        if cached and cached[0] == stat.st_mtime_ns:
+            return cached[1]
+
+        config = orjson.loads(config_file.read_bytes())
+        self._config_cache[str(config_file)] = (stat.st_mtime_ns, config)
+        return config
+
+    async def _list_t10_containers(self, max_age: float = 10.0):
+        """List t10 containers, sharing one daemon round-trip per tick.
+
+        The health, crash and cleanup loops all need the same container
+        list; a short-lived snapshot lets overlapping ticks reuse a single
+        `GET /containers/json` instead of three.
+        """
+        now = time.time()
+        if now - self._snapshot_taken_at > max_age:
+            # docker-py is synchronous; run it off-loop so the monitor
+            # coroutines keep interleaving during the daemon round-trip
+            self._container_snapshot = await asyncio.to_thread(
+                self.docker_client.containers.list,
+                all=True,
+                filters={'name': 't10_'}
+            )
+            self._snapshot_taken_at = time.time()
+        return self._container_snapshot
+
     async def start_monitoring(self):
         """Start the monitoring loop"""
         self.running = True
         self.nitrix_monitor_active = True
+        self.loop = asyncio.get_running_loop()
         self.logger.info("Starting Nitrix bot monitoring system")
-        
+
         self._setup_git_watchers()
+
+        # The monitor is the long-lived process with a running loop, so
+        # it hosts the scheduler; one-shot CLI calls only persist rows
+        self.scheduler = BotScheduler(runner=self.runner)
+        self.scheduler.start_scheduler()
         
         tasks = [
             self._monitor_bot_health(),
@@ -52,6 +248,9 @@ class BotMonitor:
         except Exception as e:
             self.logger.error(f"Monitor error: {e}")
         finally:
+            if self.scheduler is not None:
+                self.scheduler.stop_scheduler()
+            await self.bot_state.flush()
             self.running = False
             self.nitrix_monitor_active = False
 
@@ -59,19 +258,22 @@ class BotMonitor:
         """Monitor bot health and restart if needed"""
         while self.running:
             try:
-                Bot = Query()
-                running_bots = self.bots_table.search(Bot.status == 'running')
-                
-                for bot_record in running_bots:
+                running_bots = self.bot_state.running_bots()
+
+                health_results = await asyncio.gather(
+                    *[self._is_container_healthy(b['name']) for b in running_bots]
+                )
+
+                for bot_record, healthy in zip(running_bots, health_results):
                     bot_name = bot_record['name']
                     config = bot_record.get('config', {})
-                    
-                    if not await self._is_container_healthy(bot_name):
+
+                    if not healthy:
                         self.logger.warning(f"Bot {bot_name} appears unhealthy")
-                        
+
                         if config.get('restart_on_crash', True):
                             await self._handle_bot_crash(bot_name, config)
-                
+
                 await asyncio.sleep(30)
                 
             except Exception as e:
@@ -82,11 +284,8 @@ class BotMonitor:
         """Monitor for crashed containers"""
         while self.running:
             try:
-                containers = self.docker_client.containers.list(
-                    all=True,
-                    filters={'name': 't10_'}
-                )
-                
+                containers = await self._list_t10_containers()
+
                 for container in containers:
                     if container.status in ['exited', 'dead']:
                         bot_name = container.name.replace('t10_', '')
@@ -102,19 +301,29 @@ class BotMonitor:
         """Clean up dead containers periodically"""
         while self.running:
             try:
-                containers = self.docker_client.containers.list(
-                    all=True,
-                    filters={'status': 'exited', 'name': 't10_'}
-                )
-                
-                for container in containers:
-                    if container.status == 'exited':
-                        try:
-                            container.remove()
+                containers = await self._list_t10_containers()
+                exited = [c for c in containers if c.status == 'exited']
+
+                if exited:
+                    # Removals are blocking SDK calls; run them in threads
+                    # concurrently, capped so we don't overwhelm dockerd
+                    semaphore = asyncio.Semaphore(8)
+
+                    async def remove_container(container):
+                        async with semaphore:
+                            await asyncio.to_thread(container.remove)
+
+                    results = await asyncio.gather(
+                        *(remove_container(c) for c in exited),
+                        return_exceptions=True
+                    )
+
+                    for container, result in zip(exited, results):
+                        if isinstance(result, Exception):
+                            self.logger.error(f"Failed to cleanup container {container.name}: {result}")
+                        else:
                             self.logger.info(f"Cleaned up container: {container.name}")
-                        except Exception as e:
-                            self.logger.error(f"Failed to cleanup container {container.name}: {e}")
-                
+
                 await asyncio.sleep(300)  # Clean up every 5 minutes
                 
             except Exception as e:
@@ -125,18 +334,21 @@ class BotMonitor:
         """Check if a bot container is healthy"""
         try:
             container_name = f"t10_{bot_name}"
-            container = self.docker_client.containers.get(container_name)
-            
-            if container.status != 'running':
-                return False
-            
-            # Check if container is responsive
-            try:
-                stats = container.stats(stream=False)
-                return True
-            except:
+            container = await asyncio.to_thread(
+                self.docker_client.containers.get, container_name
+            )
+
+            # Inspect is near-instant; stats(stream=False) blocks ~1s per
+            # container waiting for two samples, which is far too slow for
+            # the 30s health loop.
+            await asyncio.to_thread(container.reload)
+            state = container.attrs.get('State', {})
+
+            if not state.get('Running'):
                 return False
-                
+
+            return state.get('Health', {}).get('Status', 'healthy') != 'unhealthy'
+
         except docker.errors.NotFound:
             return False
         except Exception as e:
@@ -152,13 +364,13 @@ class BotMonitor:
             try:
                 self.logger.info(f"Attempting to restart {bot_name} (attempt {attempt + 1}/{max_retries})")
                 
-                from .runner import BotRunner
-                runner = BotRunner()
-                
-                success = await runner.restart_bot(bot_name)
+                success = await self.runner.restart_bot(bot_name)
                 
                 if success:
                     self.logger.info(f"Successfully restarted {bot_name}")
+                    # restart_bot wrote status='running' straight to the
+                    # database; mirror it so cached reads agree
+                    self.bot_state.absorb(bot_name, {'status': 'running'})
                     
                     if config.get('webhook_url'):
                         await self.webhook.send_notification(
@@ -187,22 +399,26 @@ class BotMonitor:
     async def _handle_container_crash(self, bot_name: str, container):
         """Handle when we detect a crashed container"""
         try:
-            Bot = Query()
-            bot_record = self.bots_table.get(Bot.name == bot_name)
-            
+            bot_record = self.bot_state.get(bot_name)
+
             if not bot_record or bot_record.get('status') != 'running':
                 return
-            
+
             # Update status to crashed
-            self.bots_table.update({
+            self.bot_state.update(bot_name, {
                 'status': 'crashed',
                 'crashed_at': time.time(),
                 'exit_code': container.attrs.get('State', {}).get('ExitCode', -1)
-            }, Bot.name == bot_name)
+            })
             
             config = bot_record.get('config', {})
             
             if config.get('restart_on_crash', True):
+                # Persist the crashed record now: the restart writes
+                # status='running' straight to the database, and a
+                # debounced flush landing after it would clobber that
+                # with this stale record
+                await self.bot_state.flush()
                 await self._handle_bot_crash(bot_name, config)
             
         except Exception as e:
@@ -211,27 +427,29 @@ class BotMonitor:
     def _setup_git_watchers(self):
         """Setup file watchers for git repositories"""
         try:
-            bots_dir = Path('bots')
+            bots_dir = BOTS_DIR
             if not bots_dir.exists():
                 return
                 
             self.observer = Observer()
-            
+            handler = GitWatcher(self)
+
             for bot_dir in bots_dir.iterdir():
                 if bot_dir.is_dir() and (bot_dir / '.git').exists():
                     config_file = bot_dir / 'config.json'
                     if config_file.exists():
-                        with open(config_file, 'r') as f:
-                            config = json.load(f)
-                        
+                        config = self._load_config(config_file)
+
                         if config.get('git_auto_pull', False):
+                            git_dir = bot_dir / '.git'
+                            handler.add_repo(git_dir, bot_dir.name)
                             self.observer.schedule(
-                                GitWatcher(self),
-                                str(bot_dir / '.git'),
-                                recursive=True
+                                handler,
+                                str(git_dir),
+                                recursive=False
                             )
                             self.logger.info(f"Watching git repo for {bot_dir.name}")
-            
+
             self.observer.start()
             
         except Exception as e:
@@ -242,29 +460,34 @@ class BotMonitor:
         try:
             self.logger.info(f"Git update detected for {bot_name}")
             
-            bot_dir = Path(f'bots/{bot_name}')
-            
-            # Pull latest changes
-            result = await asyncio.create_subprocess_exec(
-                'git', 'pull', 'origin', 'main',
-                cwd=bot_dir,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await result.communicate()
-            
-            if result.returncode == 0:
+            bot_dir = BOTS_DIR / bot_name
+
+            # Pull latest changes - in-process via libgit2 when available
+            # (no fork/exec or repo-open cost per event), subprocess git
+            # otherwise
+            if pygit2 is not None:
+                success = await asyncio.to_thread(self._pull_in_process, bot_name, bot_dir)
+                error_output = '' if success else 'libgit2 fetch/merge failed'
+            else:
+                result = await asyncio.create_subprocess_exec(
+                    'git', 'pull', 'origin', 'main',
+                    cwd=bot_dir,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+
+                stdout, stderr = await result.communicate()
+                success = result.returncode == 0
+                error_output = stderr.decode()
+
+            if success:
                 self.logger.info(f"Git pull successful for {bot_name}")
                 
                 # Restart the bot
-                from .runner import BotRunner
-                runner = BotRunner()
-                await runner.restart_bot(bot_name)
+                await self.runner.restart_bot(bot_name)
                 
                 # Send webhook notification
-                Bot = Query()
-                bot_record = self.bots_table.get(Bot.name == bot_name)
+                bot_record = self.bot_state.get(bot_name)
                 if bot_record and bot_record.get('config', {}).get('webhook_url'):
                     await self.webhook.send_notification(
                         bot_record['config']['webhook_url'],
@@ -272,31 +495,104 @@ class BotMonitor:
                         "info"
                     )
             else:
-                self.logger.error(f"Git pull failed for {bot_name}: {stderr.decode()}")
-                
+                self.logger.error(f"Git pull failed for {bot_name}: {error_output}")
+
         except Exception as e:
             self.logger.error(f"Git update error for {bot_name}: {e}")
 
+    def _pull_in_process(self, bot_name: str, bot_dir: Path) -> bool:
+        """Fetch and fast-forward origin/main with libgit2.
+
+        The open Repository is cached per bot so the repo-open cost is
+        paid once, not on every HEAD event.
+        """
+        repo = self._repos.get(bot_name)
+        if repo is None:
+            repo = pygit2.Repository(str(bot_dir))
+            self._repos[bot_name] = repo
+
+        repo.remotes['origin'].fetch()
+        target = repo.lookup_reference('refs/remotes/origin/main').target
+        analysis, _ = repo.merge_analysis(target)
+
+        if analysis & pygit2.GIT_MERGE_ANALYSIS_UP_TO_DATE:
+            return True
+
+        if analysis & pygit2.GIT_MERGE_ANALYSIS_FASTFORWARD:
+            repo.checkout_tree(repo.get(target))
+            repo.head.set_target(target)
+            return True
+
+        # Diverged history needs a real merge; leave that to the operator
+        self.logger.error(f"Cannot fast-forward {bot_name}, local history diverged")
+        return False
+
     async def tail_logs(self, bot_name: str):
         """Tail logs for a specific bot"""
         try:
-            log_file = Path(f"bots/{bot_name}/logs/bot.log")
-            
+            log_file = BOTS_DIR.joinpath(bot_name, 'logs', 'bot.log')
+
             if not log_file.exists():
                 self.logger.error(f"Log file not found: {log_file}")
                 return
-            
-            # Follow the log file
-            with open(log_file, 'r') as f:
-                f.seek(0, 2)  # Go to end of file
-                
+
+            # Wake on filesystem events instead of polling every 100ms
+            loop = asyncio.get_running_loop()
+            events = asyncio.Queue()
+            handler = _LogTailHandler(log_file, loop, events)
+
+            observer = Observer()
+            observer.schedule(handler, str(log_file.parent))
+            observer.start()
+
+            fd = os.open(log_file, os.O_RDONLY)
+            try:
+                stdout_fd = sys.stdout.fileno()
+                use_sendfile = hasattr(os, 'sendfile')
+                pos = os.fstat(fd).st_size
+
                 while True:
-                    line = f.readline()
-                    if not line:
-                        await asyncio.sleep(0.1)
+                    size = os.fstat(fd).st_size
+
+                    if size < pos:
+                        pos = 0  # file was truncated in place
+
+                    if size > pos:
+                        if use_sendfile:
+                            # Kernel-to-kernel copy: new bytes go straight
+                            # from the log file to stdout without decoding
+                            # each line in Python
+                            sys.stdout.flush()
+                            try:
+                                while pos < size:
+                                    sent = os.sendfile(stdout_fd, fd, pos, size - pos)
+                                    if sent == 0:
+                                        break
+                                    pos += sent
+                                continue
+                            except OSError:
+                                use_sendfile = False
+
+                        os.lseek(fd, pos, os.SEEK_SET)
+                        chunk = os.read(fd, size - pos)
+                        pos += len(chunk)
+                        sys.stdout.write(chunk.decode('utf-8', errors='replace'))
+                        sys.stdout.flush()
                         continue
-                    print(line.strip())
-                    
+
+                    event = await events.get()
+                    if event == 'rotated':
+                        # Log was rotated/recreated; reopen from the start
+                        os.close(fd)
+                        while not log_file.exists():
+                            await asyncio.sleep(0.5)
+                        fd = os.open(log_file, os.O_RDONLY)
+                        pos = 0
+            finally:
+                os.close(fd)
+                observer.stop()
+                observer.join()
+
         except KeyboardInterrupt:
             pass
         except Exception as e:
@@ -306,9 +602,11 @@ class BotMonitor:
         """Get detailed metrics for a bot"""
         try:
             container_name = f"t10_{bot_name}"
-            container = self.docker_client.containers.get(container_name)
-            
-            stats = container.stats(stream=False)
+            container = await asyncio.to_thread(
+                self.docker_client.containers.get, container_name
+            )
+
+            stats = await asyncio.to_thread(container.stats, stream=False)
             
             # Calculate CPU usage
             cpu_delta = stats['cpu_stats']['cpu_usage']['total_usage'] - \
@@ -341,14 +639,24 @@ class BotMonitor:
         """Calculate container uptime"""
         try:
             started_at = container.attrs['State']['StartedAt']
-            from datetime import datetime
-            start_time = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
-            uptime = datetime.now(start_time.tzinfo) - start_time
-            
-            days = uptime.days
-            hours, remainder = divmod(uptime.seconds, 3600)
+
+            # ISO parsing plus tz-aware subtraction per call adds up over
+            # a fleet; cache the start epoch until StartedAt changes
+            # (i.e. the container restarted)
+            cached = self._start_epoch.get(container.id)
+            if cached and cached[0] == started_at:
+                start_epoch = cached[1]
+            else:
+                from datetime import datetime
+                start_time = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
+                start_epoch = start_time.timestamp()
+                self._start_epoch[container.id] = (started_at, start_epoch)
+
+            uptime_seconds = int(time.time() - start_epoch)
+            days, remainder = divmod(uptime_seconds, 86400)
+            hours, remainder = divmod(remainder, 3600)
             minutes, _ = divmod(remainder, 60)
-            
+
             if days > 0:
                 return f"{days}d {hours}h {minutes}m"
             elif hours > 0:
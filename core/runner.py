@@ -1,62 +1,97 @@
 import asyncio
-import json
+import functools
+import hashlib
 import subprocess
 import time
 import signal
 import os
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional
-import docker
-import psutil
-from tinydb import TinyDB, Query
+import orjson
 
 from utils.logger import get_logger
 from utils.validator import TokenValidator
 from utils.webhook import WebhookNotifier
+from .database import BotDatabase
+
+BOTS_DIR = Path('bots')
+
+# Container event actions that change running state; dockerd also emits
+# health_status/exec_* noise that must not clobber the status map
+_RUNNING_ACTIONS = frozenset({'start', 'restart', 'unpause'})
+_STOPPED_ACTIONS = frozenset({'create', 'die', 'stop', 'kill', 'destroy', 'pause', 'oom'})
+
+@functools.lru_cache(maxsize=256)
+def _read_config_cached(path_str: str, mtime_ns: int, size: int) -> Dict:
+    """Parse a config file once per (path, mtime, size); callers must not
+    mutate the returned dict."""
+    with open(path_str, 'rb') as f:
+        return orjson.loads(f.read())
+
+@functools.lru_cache(maxsize=256)
+def _read_env_cached(path_str: str, mtime_ns: int, size: int) -> Dict[str, str]:
+    # Single pass over the raw bytes; decoding only the kept key/value
+    # pairs is faster than line-by-line text iteration
+    env_vars = {}
+    for raw in Path(path_str).read_bytes().splitlines():
+        raw = raw.strip()
+        if not raw or raw[:1] == b'#' or b'=' not in raw:
+            continue
+        key, _, value = raw.partition(b'=')
+        env_vars[key.strip().decode()] = value.strip().strip(b'"\'').decode()
+    return env_vars
 
 class BotRunner:
     def __init__(self):
-        self.db = TinyDB('data/t10.db')
-        self.bots_table = self.db.table('bots')
+        self.db = BotDatabase()
         self.logger = get_logger('runner')
-        self.docker_client = docker.from_env()
         self.validator = TokenValidator()
         self.webhook = WebhookNotifier()
         self.nitrix_processes = {}
+        self._status = {}  # bot_name -> last docker event action
+        self._events_thread = None
         
         os.makedirs('data', exist_ok=True)
         os.makedirs('bots', exist_ok=True)
 
+    @functools.cached_property
+    def docker_client(self):
+        """Connect to dockerd on first container operation.
+
+        docker-py drags in requests and urllib3; importing it lazily
+        (and publishing the module global for the except clauses below)
+        keeps CLI commands that never touch containers off that cost.
+        """
+        global docker
+        import docker
+        os.environ.setdefault('DOCKER_BUILDKIT', '1')
+        return docker.from_env()
+
     async def start_bot(self, bot_name: str, config_path: Optional[str] = None, env_path: Optional[str] = None) -> bool:
         try:
-            bot_dir = Path(f"bots/{bot_name}")
-            if not bot_dir.exists():
-                self.logger.error(f"Bot directory not found: {bot_dir}")
-                return False
+            # Opening the files directly replaces the exists() checks, so
+            # each one costs a single open instead of a stat plus an open
+            bot_dir = BOTS_DIR / bot_name
 
-            config_file = bot_dir / (config_path or "config.json")
-            if not config_file.exists():
-                self.logger.error(f"Config file not found: {config_file}")
+            config = self._load_config_file(bot_dir / (config_path or "config.json"))
+            if config is None:
                 return False
 
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-
-            env_file = bot_dir / (env_path or config.get('env_file', 'env'))
-            if not env_file.exists():
-                self.logger.error(f"Environment file not found: {env_file}")
+            env_vars = self._load_env_file(bot_dir / (env_path or config.get('env_file', 'env')))
+            if env_vars is None:
                 return False
 
             if await self._is_bot_running(bot_name):
                 self.logger.warning(f"Bot {bot_name} is already running")
                 return False
 
-            token = self._extract_token_from_env(env_file)
+            token = env_vars.get('BOT_TOKEN')
             if token and not await self.validator.validate_token(token):
                 self.logger.error(f"Invalid token for bot {bot_name}")
                 return False
 
-            success = await self._start_docker_container(bot_name, config, bot_dir)
+            success = await self._start_docker_container(bot_name, config, bot_dir, env_vars)
             
             if success:
                 self._update_bot_record(bot_name, 'running', config)
@@ -80,16 +115,17 @@ class BotRunner:
             container_name = f"t10_{bot_name}"
             
             try:
-                container = self.docker_client.containers.get(container_name)
-                container.stop(timeout=10)
-                container.remove()
+                container = await asyncio.to_thread(
+                    self.docker_client.containers.get, container_name
+                )
+                await asyncio.to_thread(container.stop, timeout=10)
+                await asyncio.to_thread(container.remove)
                 self.logger.info(f"Stopped Docker container for {bot_name}")
             except docker.errors.NotFound:
                 self.logger.warning(f"Container {container_name} not found")
             
-            Bot = Query()
-            self.bots_table.update({'status': 'stopped', 'stopped_at': time.time()}, 
-                                 Bot.name == bot_name)
+            self.db.update_bot(bot_name, {'status': 'stopped',
+                                          'stopped_at': time.time()})
             
             if bot_name in self.nitrix_processes:
                 del self.nitrix_processes[bot_name]
@@ -102,8 +138,26 @@ class BotRunner:
 
     async def restart_bot(self, bot_name: str) -> bool:
         try:
-            await self.stop_bot(bot_name)
-            await asyncio.sleep(2)
+            bot_dir = BOTS_DIR / bot_name
+            config = self._load_config_file(bot_dir / "config.json")
+
+            # The image build does not depend on the old container, so it
+            # runs concurrently with the stop instead of after it
+            if config is not None:
+                await asyncio.gather(
+                    self.stop_bot(bot_name),
+                    asyncio.to_thread(self._ensure_image, bot_name, config, bot_dir)
+                )
+            else:
+                await self.stop_bot(bot_name)
+
+            # Back off briefly until teardown finishes rather than
+            # paying a fixed 2s sleep on every restart
+            delay = 0.1
+            while delay <= 0.8 and await self._is_bot_running(bot_name):
+                await asyncio.sleep(delay)
+                delay *= 2
+
             return await self.start_bot(bot_name)
         except Exception as e:
             self.logger.error(f"Failed to restart bot {bot_name}: {e}")
@@ -112,7 +166,7 @@ class BotRunner:
     async def list_bots(self) -> List[Dict]:
         try:
             bots = []
-            for record in self.bots_table.all():
+            for record in self.db.all_bots():
                 bot_info = {
                     'name': record['name'],
                     'status': record.get('status', 'unknown'),
@@ -125,32 +179,27 @@ class BotRunner:
             self.logger.error(f"Failed to list bots: {e}")
             return []
 
-    async def _start_docker_container(self, bot_name: str, config: Dict, bot_dir: Path) -> bool:
+    async def _start_docker_container(self, bot_name: str, config: Dict, bot_dir: Path,
+                                      env_vars: Dict[str, str]) -> bool:
         try:
             container_name = f"t10_{bot_name}"
-            dockerfile_path = bot_dir / config.get('dockerfile', 'dockerfile')
-            
-            if not dockerfile_path.exists():
-                self.logger.error(f"Dockerfile not found: {dockerfile_path}")
-                return False
 
             try:
-                existing_container = self.docker_client.containers.get(container_name)
-                existing_container.remove(force=True)
+                existing_container = await asyncio.to_thread(
+                    self.docker_client.containers.get, container_name
+                )
+                await asyncio.to_thread(existing_container.remove, force=True)
             except docker.errors.NotFound:
                 pass
 
-            image_tag = f"t10/{bot_name}:latest"
-            self.docker_client.images.build(
-                path=str(bot_dir),
-                dockerfile=config.get('dockerfile', 'dockerfile'),
-                tag=image_tag,
-                rm=True
+            # Every Docker call below is a blocking round-trip to dockerd;
+            # running them in threads lets several bots start concurrently
+            image_tag = await asyncio.to_thread(
+                self._ensure_image, bot_name, config, bot_dir
             )
 
-            env_vars = self._load_env_file(bot_dir / config.get('env_file', 'env'))
-            
-            container = self.docker_client.containers.run(
+            container = await asyncio.to_thread(
+                self.docker_client.containers.run,
                 image_tag,
                 name=container_name,
                 detach=True,
@@ -172,10 +221,76 @@ class BotRunner:
             self.logger.error(f"Failed to start Docker container for {bot_name}: {e}")
             return False
 
+    def _ensure_image(self, bot_name: str, config: Dict, bot_dir: Path) -> str:
+        """Build the bot image only when its build inputs changed.
+
+        The tag carries a fingerprint of the build context, so a restart
+        with an unchanged bot skips the docker build entirely.
+        """
+        dockerfile = config.get('dockerfile', 'dockerfile')
+        image_tag = f"t10/{bot_name}:{self._context_fingerprint(bot_dir, dockerfile)}"
+
+        if self.docker_client.images.list(name=image_tag):
+            self.logger.info(f"Image {image_tag} already built, skipping build")
+            return image_tag
+
+        self.docker_client.images.build(
+            path=str(bot_dir),
+            dockerfile=dockerfile,
+            tag=image_tag,
+            cache_from=[f"t10/{bot_name}:latest"],
+            rm=True
+        )
+        self.docker_client.api.tag(image_tag, f"t10/{bot_name}", 'latest', force=True)
+        self._prune_old_images(bot_name, image_tag)
+        return image_tag
+
+    def _prune_old_images(self, bot_name: str, current_tag: str):
+        """Untag fingerprints superseded by a successful build.
+
+        Without this every content change mints a new t10/{bot}:<hash>
+        tag and images accumulate without bound; :latest stays so the
+        build cache chain survives.
+        """
+        try:
+            latest_tag = f"t10/{bot_name}:latest"
+            for image in self.docker_client.images.list(name=f"t10/{bot_name}"):
+                for tag in image.tags:
+                    if tag not in (current_tag, latest_tag):
+                        self.docker_client.images.remove(tag)
+        except Exception as e:
+            self.logger.warning(f"Failed to prune old images for {bot_name}: {e}")
+
+    def _context_fingerprint(self, bot_dir: Path, dockerfile: str) -> str:
+        digest = hashlib.blake2b()
+        digest.update((bot_dir / dockerfile).read_bytes())
+
+        # (path, mtime, size) of the context stands in for hashing file
+        # contents; logs are volume-mounted and .git churns on every
+        # fetch without changing the worktree, so both stay out
+        for root, dirs, files in os.walk(bot_dir):
+            dirs[:] = [d for d in dirs if d not in ('logs', '.git')]
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                st = os.stat(path)
+                digest.update(
+                    f"{os.path.relpath(path, bot_dir)}:{st.st_mtime_ns}:{st.st_size}".encode()
+                )
+
+        return digest.hexdigest()[:16]
+
     async def _is_bot_running(self, bot_name: str) -> bool:
         try:
-            container_name = f"t10_{bot_name}"
-            container = self.docker_client.containers.get(container_name)
+            self._ensure_events_pump()
+
+            status = self._status.get(bot_name)
+            if status is not None:
+                return status == 'start'
+
+            # Bot not seen by the event stream yet; ask dockerd directly
+            container = await asyncio.to_thread(
+                self.docker_client.containers.get, f"t10_{bot_name}"
+            )
             return container.status == 'running'
         except docker.errors.NotFound:
             return False
@@ -183,44 +298,77 @@ class BotRunner:
             self.logger.error(f"Error checking bot status: {e}")
             return False
 
-    def _extract_token_from_env(self, env_file: Path) -> Optional[str]:
+    def _ensure_events_pump(self):
+        if self._events_thread is None:
+            self._events_thread = threading.Thread(
+                target=self._events_pump, daemon=True, name='t10-docker-events'
+            )
+            self._events_thread.start()
+
+    def _events_pump(self):
+        """Maintain bot statuses from dockerd's event stream.
+
+        One long-lived subscription replaces a containers.get round-trip
+        per status check, so checking N bots costs N dict reads.
+        """
         try:
-            with open(env_file, 'r') as f:
-                for line in f:
-                    if line.strip().startswith('BOT_TOKEN='):
-                        return line.strip().split('=', 1)[1].strip('"\'')
+            # Subscribe before priming so no event slips between the two
+            events = self.docker_client.events(
+                decode=True, filters={'type': 'container'}
+            )
+
+            for container in self.docker_client.containers.list(all=True):
+                if container.name.startswith('t10_'):
+                    self._status[container.name[4:]] = (
+                        'start' if container.status == 'running' else 'stop'
+                    )
+
+            for event in events:
+                name = event.get('Actor', {}).get('Attributes', {}).get('name', '')
+                if not name.startswith('t10_'):
+                    continue
+                action = event.get('Action')
+                if action in _RUNNING_ACTIONS:
+                    self._status[name[4:]] = 'start'
+                elif action in _STOPPED_ACTIONS:
+                    self._status[name[4:]] = 'stop'
+
+        except Exception as e:
+            self.logger.error(f"Docker events stream ended: {e}")
+            self._status.clear()
+            self._events_thread = None
+
+    def _load_config_file(self, config_file: Path) -> Optional[Dict]:
+        # Keyed on mtime+size, so scheduler-driven restarts skip the
+        # JSON parse unless the file actually changed
+        try:
+            st = os.stat(config_file)
+            return _read_config_cached(str(config_file), st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            self.logger.error(f"Config file not found: {config_file}")
             return None
         except Exception as e:
-            self.logger.error(f"Failed to extract token from {env_file}: {e}")
+            self.logger.error(f"Failed to load config file {config_file}: {e}")
             return None
 
-    def _load_env_file(self, env_file: Path) -> Dict[str, str]:
-        env_vars = {}
+    def _load_env_file(self, env_file: Path) -> Optional[Dict[str, str]]:
         try:
-            with open(env_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        env_vars[key.strip()] = value.strip().strip('"\'')
+            st = os.stat(env_file)
+            return _read_env_cached(str(env_file), st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            self.logger.error(f"Environment file not found: {env_file}")
+            return None
         except Exception as e:
             self.logger.error(f"Failed to load env file {env_file}: {e}")
-        return env_vars
+            return None
 
     def _update_bot_record(self, bot_name: str, status: str, config: Dict):
-        Bot = Query()
-        record = {
-            'name': bot_name,
+        self.db.upsert_bot(bot_name, {
             'status': status,
             'config': config,
             'started_at': time.time() if status == 'running' else None,
             'nitrix_managed': True
-        }
-        
-        if self.bots_table.search(Bot.name == bot_name):
-            self.bots_table.update(record, Bot.name == bot_name)
-        else:
-            self.bots_table.insert(record)
+        })
 
     def _calculate_uptime(self, started_at: Optional[float]) -> str:
         if not started_at:
@@ -237,8 +385,10 @@ class BotRunner:
     async def health_check(self) -> Dict[str, any]:
         """Health check for monitoring"""
         try:
-            total_bots = len(self.bots_table.all())
-            running_bots = len([b for b in self.bots_table.all() if b.get('status') == 'running'])
+            # One table scan for both counts
+            records = self.db.all_bots()
+            total_bots = len(records)
+            running_bots = sum(1 for b in records if b.get('status') == 'running')
             
             return {
                 'status': 'healthy',
@@ -1,22 +1,37 @@
 import asyncio
-import schedule
+import heapq
 import time
-import threading
 from typing import Dict, Optional
-from tinydb import TinyDB, Query
 import re
 
 from utils.logger import get_logger
+from .database import BotDatabase
+
+# Matches patterns like "2h", "30m", "1d", "2.5h"
+_SCHEDULE_RE = re.compile(r'^(\d+(?:\.\d+)?)(h|m|d)$')
+_UNIT_MULT = {'m': 1, 'h': 60, 'd': 1440}
+_TIME_UNITS = ((86400, 'd'), (3600, 'h'), (60, 'm'))
 
 class BotScheduler:
-    def __init__(self):
-        self.db = TinyDB('data/t10.db')
-        self.schedules_table = self.db.table('schedules')
+    def __init__(self, runner=None):
+        self.db = BotDatabase()
         self.logger = get_logger('scheduler')
-        self.scheduler_thread = None
         self.running = False
         self.nitrix_scheduler_active = False
-        
+        self._heap = []  # (next_run_ts, bot_name), lazily pruned
+        self._intervals = {}  # bot_name -> interval minutes
+        self._wake = None  # created on the scheduler's event loop
+        self._task = None
+        self._runner = runner
+
+    @property
+    def runner(self):
+        """Single BotRunner shared by every scheduled fire."""
+        if self._runner is None:
+            from .runner import BotRunner
+            self._runner = BotRunner()
+        return self._runner
+
     def add_schedule(self, bot_name: str, schedule_time: str) -> bool:
         """Add scheduled restart for a bot"""
         try:
@@ -24,32 +39,25 @@ class BotScheduler:
             if not interval:
                 self.logger.error(f"Invalid schedule format: {schedule_time}")
                 return False
-            
-            Schedule = Query()
-            existing = self.schedules_table.get(Schedule.bot_name == bot_name)
-            
-            schedule_record = {
-                'bot_name': bot_name,
+
+            now = time.time()
+            self.db.upsert_schedule(bot_name, {
                 'schedule_time': schedule_time,
                 'interval_minutes': interval,
-                'created_at': time.time(),
+                'created_at': now,
                 'last_run': None,
+                'next_run_ts': now + interval * 60,
                 'nitrix_managed': True
-            }
-            
-            if existing:
-                self.schedules_table.update(schedule_record, Schedule.bot_name == bot_name)
-            else:
-                self.schedules_table.insert(schedule_record)
-            
-            self._setup_schedule(bot_name, interval)
+            })
+
+            self._push(bot_name, interval)
             self.logger.info(f"Scheduled restart for {bot_name} every {schedule_time}")
-            
+
             if not self.running:
                 self.start_scheduler()
-            
+
             return True
-            
+
         except Exception as e:
             self.logger.error(f"Failed to add schedule for {bot_name}: {e}")
             return False
@@ -57,18 +65,19 @@ class BotScheduler:
     def remove_schedule(self, bot_name: str) -> bool:
         """Remove scheduled restart for a bot"""
         try:
-            Schedule = Query()
-            result = self.schedules_table.remove(Schedule.bot_name == bot_name)
-            
+            result = self.db.remove_schedule(bot_name)
+
             if result:
-                # Clear from schedule module
-                schedule.clear(bot_name)
+                # Heap entries for this bot are pruned lazily by the run task
+                self._intervals.pop(bot_name, None)
+                if self._wake is not None:
+                    self._wake.set()
                 self.logger.info(f"Removed schedule for {bot_name}")
                 return True
             else:
                 self.logger.warning(f"No schedule found for {bot_name}")
                 return False
-                
+
         except Exception as e:
             self.logger.error(f"Failed to remove schedule for {bot_name}: {e}")
             return False
@@ -77,7 +86,7 @@ class BotScheduler:
         """List all scheduled restarts"""
         try:
             schedules = []
-            for record in self.schedules_table.all():
+            for record in self.db.all_schedules():
                 schedule_info = {
                     'bot_name': record['bot_name'],
                     'schedule_time': record['schedule_time'],
@@ -91,78 +100,129 @@ class BotScheduler:
             return []
 
     def start_scheduler(self):
-        """Start the scheduler in a separate thread"""
+        """Start the scheduler task on the running event loop"""
         if self.running:
             return
-            
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop yet (e.g. one-shot CLI call); the schedule is
+            # persisted and picked up when a long-lived process starts
+            self.logger.info("No running event loop; scheduler will start with the monitor")
+            return
+
         self.running = True
         self.nitrix_scheduler_active = True
-        self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
-        self.scheduler_thread.start()
+        self._load_persisted_schedules()
+        self._task = loop.create_task(self._run_scheduler())
         self.logger.info("Nitrix scheduler started")
 
     def stop_scheduler(self):
         """Stop the scheduler"""
         self.running = False
         self.nitrix_scheduler_active = False
-        schedule.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._heap.clear()
+        self._intervals.clear()
         self.logger.info("Scheduler stopped")
 
-    def _run_scheduler(self):
-        """Main scheduler loop"""
+    async def _run_scheduler(self):
+        """Main scheduler loop: sleep exactly until the next due restart.
+
+        A heap of (next_run_ts, bot_name) replaces the old per-minute
+        polling thread, so fires land on time instead of up to 60s late
+        and no wakeups happen while nothing is due.
+        """
+        self._wake = asyncio.Event()
+
         while self.running:
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                if not self._heap:
+                    await self._wake.wait()
+                    self._wake.clear()
+                    continue
+
+                next_ts, bot_name = self._heap[0]
+
+                if bot_name not in self._intervals:
+                    heapq.heappop(self._heap)  # schedule was removed
+                    continue
+
+                delay = next_ts - time.time()
+                if delay > 0:
+                    # Wake early if a schedule is added or removed
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                        self._wake.clear()
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                heapq.heappop(self._heap)
+                await self._fire(bot_name)
+
+                interval = self._intervals.get(bot_name)
+                if interval:
+                    heapq.heappush(self._heap, (time.time() + interval * 60, bot_name))
+
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 self.logger.error(f"Scheduler error: {e}")
-                time.sleep(60)
+                await asyncio.sleep(60)
+
+    def _push(self, bot_name: str, interval_minutes: int, next_run: Optional[float] = None):
+        """Queue the next restart for a bot and wake the run task"""
+        self._intervals[bot_name] = interval_minutes
+        if next_run is None:
+            next_run = time.time() + interval_minutes * 60
+        heapq.heappush(self._heap, (next_run, bot_name))
+        if self._wake is not None:
+            self._wake.set()
 
-    def _setup_schedule(self, bot_name: str, interval_minutes: int):
-        """Setup schedule for a specific bot"""
+    def _load_persisted_schedules(self):
+        """Restore schedules from the database into the timer heap"""
         try:
-            schedule.clear(bot_name)
-            
-            if interval_minutes >= 1440:  # Daily or more
-                days = interval_minutes // 1440
-                schedule.every(days).days.do(self._restart_bot, bot_name).tag(bot_name)
-            elif interval_minutes >= 60:  # Hourly
-                hours = interval_minutes // 60
-                schedule.every(hours).hours.do(self._restart_bot, bot_name).tag(bot_name)
-            else:  # Minutes
-                schedule.every(interval_minutes).minutes.do(self._restart_bot, bot_name).tag(bot_name)
-                
+            for record in self.db.all_schedules():
+                bot_name = record['bot_name']
+                interval = record.get('interval_minutes')
+                if not interval or bot_name in self._intervals:
+                    continue
+
+                last_run = record.get('last_run')
+                if last_run:
+                    next_run = max(last_run + interval * 60, time.time())
+                else:
+                    next_run = time.time() + interval * 60
+
+                self._push(bot_name, interval, next_run)
+
         except Exception as e:
-            self.logger.error(f"Failed to setup schedule for {bot_name}: {e}")
+            self.logger.error(f"Failed to load persisted schedules: {e}")
 
-    def _restart_bot(self, bot_name: str):
-        """Restart a bot (called by scheduler)"""
+    async def _fire(self, bot_name: str):
+        """Restart a bot (called by the scheduler task)"""
         try:
             self.logger.info(f"Scheduled restart triggered for {bot_name}")
-            
-            # Update last run time
-            Schedule = Query()
-            self.schedules_table.update(
-                {'last_run': time.time()}, 
-                Schedule.bot_name == bot_name
-            )
-            
-            # Restart the bot
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                from .runner import BotRunner
-                runner = BotRunner()
-                result = loop.run_until_complete(runner.restart_bot(bot_name))
-                
-                if result:
-                    self.logger.info(f"Scheduled restart successful for {bot_name}")
-                else:
-                    self.logger.error(f"Scheduled restart failed for {bot_name}")
-            finally:
-                loop.close()
-                
+
+            # Update last run time and the precomputed next fire time
+            now = time.time()
+            fields = {'last_run': now}
+            interval = self._intervals.get(bot_name)
+            if interval:
+                fields['next_run_ts'] = now + interval * 60
+            self.db.upsert_schedule(bot_name, fields)
+
+            result = await self.runner.restart_bot(bot_name)
+
+            if result:
+                self.logger.info(f"Scheduled restart successful for {bot_name}")
+            else:
+                self.logger.error(f"Scheduled restart failed for {bot_name}")
+
         except Exception as e:
             self.logger.error(f"Scheduled restart error for {bot_name}: {e}")
 
@@ -170,26 +230,14 @@ class BotScheduler:
         """Parse schedule time string to minutes"""
         try:
             schedule_time = schedule_time.lower().strip()
-            
-            # Match patterns like "2h", "30m", "1d", "2.5h"
-            pattern = r'^(\d+(?:\.\d+)?)(h|m|d)$'
-            match = re.match(pattern, schedule_time)
-            
+
+            match = _SCHEDULE_RE.match(schedule_time)
             if not match:
                 return None
-            
+
             value = float(match.group(1))
-            unit = match.group(2)
-            
-            if unit == 'm':
-                return int(value)
-            elif unit == 'h':
-                return int(value * 60)
-            elif unit == 'd':
-                return int(value * 1440)
-                
-            return None
-            
+            return int(value * _UNIT_MULT[match.group(2)])
+
         except Exception as e:
             self.logger.error(f"Failed to parse schedule time {schedule_time}: {e}")
             return None
@@ -197,30 +245,25 @@ class BotScheduler:
     def _calculate_next_run(self, record: Dict) -> Optional[str]:
         """Calculate next run time for a schedule"""
         try:
-            last_run = record.get('last_run')
-            interval_minutes = record.get('interval_minutes')
-            
-            if not last_run or not interval_minutes:
-                return "Soon"
-            
-            next_run_timestamp = last_run + (interval_minutes * 60)
-            current_time = time.time()
-            
-            if next_run_timestamp <= current_time:
+            # next_run_ts is precomputed when the schedule is added and
+            # after each fire, so this is a read plus one subtraction
+            next_run_timestamp = record.get('next_run_ts')
+            if not next_run_timestamp:
+                last_run = record.get('last_run')
+                interval_minutes = record.get('interval_minutes')
+                if not last_run or not interval_minutes:
+                    return "Soon"
+                next_run_timestamp = last_run + interval_minutes * 60
+
+            time_until = next_run_timestamp - time.time()
+            if time_until <= 0:
                 return "Overdue"
-            
-            time_until = next_run_timestamp - current_time
-            
-            if time_until >= 86400:  # More than a day
-                days = int(time_until // 86400)
-                return f"In {days}d"
-            elif time_until >= 3600:  # More than an hour
-                hours = int(time_until // 3600)
-                return f"In {hours}h"
-            else:  # Minutes
-                minutes = int(time_until // 60)
-                return f"In {minutes}m"
-                
+
+            for unit_seconds, unit in _TIME_UNITS:
+                if time_until >= unit_seconds:
+                    return f"In {int(time_until // unit_seconds)}{unit}"
+            return "In 0m"
+
         except Exception as e:
             self.logger.error(f"Failed to calculate next run: {e}")
             return "Unknown"
@@ -228,10 +271,11 @@ class BotScheduler:
     def get_scheduler_status(self) -> Dict:
         """Get scheduler status and statistics"""
         try:
-            total_schedules = len(self.schedules_table.all())
-            active_schedules = len([s for s in self.schedules_table.all() 
-                                  if s.get('last_run') is not None])
-            
+            records = self.db.all_schedules()
+            total_schedules = len(records)
+            active_schedules = sum(1 for s in records
+                                   if s.get('last_run') is not None)
+
             return {
                 'running': self.running,
                 'total_schedules': total_schedules,
@@ -247,16 +291,19 @@ class BotScheduler:
     def force_run_schedule(self, bot_name: str) -> bool:
         """Force run a scheduled restart immediately"""
         try:
-            Schedule = Query()
-            schedule_record = self.schedules_table.get(Schedule.bot_name == bot_name)
-            
+            schedule_record = self.db.get_schedule(bot_name)
+
             if not schedule_record:
                 self.logger.error(f"No schedule found for {bot_name}")
                 return False
-            
-            self._restart_bot(bot_name)
+
+            try:
+                loop = asyncio.get_running_loop()
+                loop.create_task(self._fire(bot_name))
+            except RuntimeError:
+                asyncio.run(self._fire(bot_name))
             return True
-            
+
         except Exception as e:
             self.logger.error(f"Failed to force run schedule for {bot_name}: {e}")
             return False
@@ -169,19 +169,26 @@ download_t10() {
     # For demo purposes, we'll create the files here
     # In production, you'd download from a repository
     
-    cat > requirements.txt << 'EOF'
+    # Prefer the requirements.txt shipped next to this script so the
+    # installed dependency list cannot drift from the repo's
+    SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+    if [ -f "$SCRIPT_DIR/requirements.txt" ] && [ "$SCRIPT_DIR" != "$T10_DIR" ]; then
+        cp "$SCRIPT_DIR/requirements.txt" requirements.txt
+    else
+        cat > requirements.txt << 'EOF'
 click>=8.1.7
 aiohttp>=3.9.0
-schedule>=1.2.0
+aiofiles>=23.2.1
 docker>=6.1.3
 psutil>=5.9.5
-tinydb>=4.8.0
+orjson>=3.9.0
 colorama>=0.4.6
 pyyaml>=6.0.1
 requests>=2.31.0
 asyncio-subprocess>=0.1.0
 watchdog>=3.0.0
 EOF
+    fi
     
     # Create empty __init__.py files
     touch core/__init__.py utils/__init__.py
@@ -404,7 +411,7 @@ post_install_setup() {
     # Initialize database
     cd $T10_DIR
     source $VENV_DIR/bin/activate
-    python -c "from tinydb import TinyDB; TinyDB('data/t10.db')" 2>/dev/null || true
+    python -c "from core.database import BotDatabase; BotDatabase()" 2>/dev/null || true
     
     log "✓ Post-installation setup complete"
 }
@@ -7,11 +7,18 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from core.cli import cli
+from core.cli import main as cli_main
 
 def main():
     try:
-        cli()
+        # libuv-based loop speeds up docker socket I/O when available
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+    try:
+        cli_main()
     except KeyboardInterrupt:
         print("\n⚡ t10 interrupted by user")
         sys.exit(0)
@@ -1,7 +1,10 @@
+import atexit
+import functools
 import logging
 import os
+import queue
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
 
 def setup_logging():
@@ -37,15 +40,22 @@ def setup_logging():
     console_handler.setFormatter(simple_formatter)
     console_handler.setLevel(logging.WARNING)
     
-    # Add handlers
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    # Loggers only enqueue records; a background thread does the actual
+    # disk writes and rotation so async code never blocks on logging
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, file_handler, console_handler,
+                             respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     
     # Silence some noisy loggers
     logging.getLogger('docker').setLevel(logging.WARNING)
     logging.getLogger('urllib3').setLevel(logging.WARNING)
     logging.getLogger('requests').setLevel(logging.WARNING)
 
+@functools.cache
 def get_logger(name: str) -> logging.Logger:
     """Get a logger with the specified name"""
     return logging.getLogger(f't10.{name}')
@@ -74,7 +84,15 @@ def setup_bot_logging(bot_name: str):
     )
     
     bot_file_handler.setFormatter(bot_formatter)
-    bot_logger.addHandler(bot_file_handler)
+
+    # Same non-blocking queue setup as the root logger
+    log_queue = queue.SimpleQueue()
+    bot_logger.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, bot_file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
     bot_logger.propagate = False
     
     return bot_logger
@@ -88,54 +106,65 @@ class NitrixLogFilter(logging.Filter):
 
 def log_bot_event(bot_name: str, event: str, details: str = None):
     """Log a bot-specific event"""
-    logger = get_logger('events')
     message = f"Bot '{bot_name}': {event}"
     if details:
         message += f" - {details}"
-    logger.info(message)
+    get_logger('events').info(message)
 
 def log_system_event(event: str, details: str = None):
     """Log a system-wide event"""
-    logger = get_logger('system')
     message = f"System: {event}"
     if details:
         message += f" - {details}"
-    logger.info(message)
+    get_logger('system').info(message)
 
 def create_crash_report(bot_name: str, error: Exception, context: dict = None):
     """Create a detailed crash report"""
-    logger = get_logger('crashes')
-    
+    import time
+    import traceback
+
+    # One timestamp read covers the report body and the filename;
+    # restart loops can call this in bursts
+    ts_ns = time.time_ns()
+
     report = [
         f"CRASH REPORT - Bot: {bot_name}",
-        f"Timestamp: {datetime.now().isoformat()}",
+        f"Timestamp: {datetime.fromtimestamp(ts_ns / 1e9).isoformat()}",
         f"Error: {type(error).__name__}: {str(error)}",
     ]
     
     if context:
         report.append("Context:")
-        for key, value in context.items():
-            report.append(f"  {key}: {value}")
+        report.extend(f"  {key}: {value}" for key, value in context.items())
     
-    # Log the full report
-    logger.error("\n".join(report))
+    report_text = "\n".join(report)
+    get_logger('crashes').error(report_text)
     
     # Also save to crash reports directory
     crash_dir = Path('logs/crashes')
     crash_dir.mkdir(exist_ok=True)
     
-    crash_file = crash_dir / f"{bot_name}_{int(datetime.now().timestamp())}.log"
+    crash_file = crash_dir / f"{bot_name}_{ts_ns // 1_000_000_000}.log"
     with open(crash_file, 'w') as f:
-        f.write("\n".join(report))
-        f.write(f"\n\nFull traceback:\n")
-        import traceback
-        f.write(traceback.format_exc())
+        f.write(report_text + "\n\nFull traceback:\n" + traceback.format_exc())
+
+def _walk_log_files(directory: str):
+    """Yield (entry, stat) for every log file under a directory.
+
+    scandir returns cached stat info with each dirent, so this costs one
+    getdents per directory instead of a stat syscall per file like rglob.
+    """
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_log_files(entry.path)
+            elif '.log' in entry.name:
+                yield entry, entry.stat()
 
 def get_log_stats() -> dict:
     """Get logging statistics"""
     try:
-        logs_dir = Path('logs')
-        if not logs_dir.exists():
+        if not os.path.isdir('logs'):
             return {'error': 'Logs directory not found'}
         
         stats = {
@@ -145,26 +174,27 @@ def get_log_stats() -> dict:
             'system_logs': []
         }
         
-        for log_file in logs_dir.rglob('*.log'):
-            file_size = log_file.stat().st_size
+        total_bytes = 0
+        for entry, st in _walk_log_files('logs'):
+            if not entry.name.endswith('.log'):
+                continue
+            total_bytes += st.st_size
             stats['total_log_files'] += 1
-            stats['total_size_mb'] += file_size / (1024 * 1024)
+            size_mb = round(st.st_size / 1048576.0, 2)
             
-            if 'bots/' in str(log_file):
-                bot_name = log_file.parent.parent.name
-                if bot_name not in stats['bot_logs']:
-                    stats['bot_logs'][bot_name] = []
-                stats['bot_logs'][bot_name].append({
-                    'file': log_file.name,
-                    'size_mb': round(file_size / (1024 * 1024), 2)
+            if 'bots/' in entry.path:
+                bot_name = Path(entry.path).parent.parent.name
+                stats['bot_logs'].setdefault(bot_name, []).append({
+                    'file': entry.name,
+                    'size_mb': size_mb
                 })
             else:
                 stats['system_logs'].append({
-                    'file': log_file.name,
-                    'size_mb': round(file_size / (1024 * 1024), 2)
+                    'file': entry.name,
+                    'size_mb': size_mb
                 })
         
-        stats['total_size_mb'] = round(stats['total_size_mb'], 2)
+        stats['total_size_mb'] = round(total_bytes / 1048576.0, 2)
         return stats
         
     except Exception as e:
@@ -173,23 +203,22 @@ def get_log_stats() -> dict:
 def cleanup_old_logs(days_to_keep: int = 30):
     """Clean up log files older than specified days"""
     try:
-        from datetime import timedelta
-        cutoff_time = datetime.now() - timedelta(days=days_to_keep)
-        
-        logs_dir = Path('logs')
+        import time
+        cutoff = time.time() - days_to_keep * 86400
         cleaned_files = 0
         
-        for log_file in logs_dir.rglob('*.log.*'):  # Rotated log files
-            if log_file.stat().st_mtime < cutoff_time.timestamp():
-                log_file.unlink()
-                cleaned_files += 1
+        for entry, st in _walk_log_files('logs'):
+            if '.log.' in entry.name and st.st_mtime < cutoff:  # Rotated log files
+                try:
+                    os.unlink(entry.path)
+                    cleaned_files += 1
+                except FileNotFoundError:
+                    pass
         
-        logger = get_logger('cleanup')
-        logger.info(f"Cleaned up {cleaned_files} old log files")
+        get_logger('cleanup').info(f"Cleaned up {cleaned_files} old log files")
         
         return cleaned_files
         
     except Exception as e:
-        logger = get_logger('cleanup')
-        logger.error(f"Failed to clean up logs: {e}")
+        get_logger('cleanup').error(f"Failed to clean up logs: {e}")
         return 0
@@ -1,16 +1,162 @@
 import asyncio
+import hashlib
+import os
+import string
+import time
+import aiofiles
 import aiohttp
+import orjson
 import re
+from collections import OrderedDict
 from typing import Optional, Dict, Tuple
 from pathlib import Path
 
 from utils.logger import get_logger
 
+# Validated tokens are reused for this long before re-hitting Discord
+TOKEN_CACHE_TTL = 60.0
+TOKEN_CACHE_MAX = 256
+FILE_CACHE_MAX = 128
+
+# Split timeouts fail fast on connect problems while still allowing a
+# slow body read; retries cover Discord's transient 429/5xx responses
+_TIMEOUT = aiohttp.ClientTimeout(total=8, connect=2, sock_connect=2, sock_read=6)
+_MAX_RETRIES = 3
+# At most this many Discord requests in flight; matches the per-host
+# connection pool so bursts stay under Discord's route buckets
+_DISCORD_CONCURRENCY = 10
+
+# Discord bot tokens are base64-ish; webhooks follow a fixed URL shape
+_TOKEN_CHARS = frozenset(string.ascii_letters + string.digits + '._-')
+_WEBHOOK_RE = re.compile(r'https://discord(?:app)?\.com/api/webhooks/\d+/[\w-]+')
+
 class TokenValidator:
+    _REQUIRED_CONFIG = frozenset({'name', 'dockerfile', 'env_file'})
+    _BOOL_FIELDS = ('auto_restart', 'restart_on_crash')
+
     def __init__(self):
         self.logger = get_logger('validator')
         self.discord_api_base = "https://discord.com/api/v10"
+        self._session = None
+        self._session_lock = asyncio.Lock()
+        self._discord_sem = asyncio.Semaphore(_DISCORD_CONCURRENCY)
+        self._token_cache = OrderedDict()  # token hash -> (checked_at, status, info)
+        self._file_cache = OrderedDict()  # (parsed, path, mtime, size) -> contents
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily build one shared session for all Discord calls.
+
+        Reusing the connection pool keeps the TCP+TLS handshake and DNS
+        lookup out of every validation instead of paying them per call.
+        """
+        if self._session is None or self._session.closed:
+            async with self._session_lock:
+                if self._session is None or self._session.closed:
+                    self._session = aiohttp.ClientSession(
+                        headers={'Content-Type': 'application/json'},
+                        connector=aiohttp.TCPConnector(
+                            limit=100,
+                            limit_per_host=_DISCORD_CONCURRENCY,
+                            ttl_dns_cache=300,
+                            keepalive_timeout=75
+                        ),
+                        timeout=_TIMEOUT
+                    )
+        return self._session
+
+    async def _read_text_cached(self, path: Path) -> str:
+        """Read a file once per (path, mtime, size).
+
+        Batch runs revisit shared config and dockerfile templates; the
+        stat key invalidates an entry as soon as the file changes.
+        """
+        return await self._cached_file(path, parse_json=False)
+
+    async def _cached_parse_json(self, path: Path) -> Dict:
+        """Parse a JSON file through the same stat-keyed cache"""
+        return await self._cached_file(path, parse_json=True)
+
+    async def _cached_file(self, path: Path, parse_json: bool):
+        st = path.stat()
+        key = (parse_json, str(path), st.st_mtime_ns, st.st_size)
+        cached = self._file_cache.get(key)
+        if cached is not None:
+            self._file_cache.move_to_end(key)
+            return cached
+
+        async with aiofiles.open(path, 'r') as f:
+            contents = await f.read()
+        if parse_json:
+            contents = orjson.loads(contents)
+
+        self._file_cache[key] = contents
+        while len(self._file_cache) > FILE_CACHE_MAX:
+            self._file_cache.popitem(last=False)
+        return contents
+
+    async def aclose(self):
+        """Close the shared session (application shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
         
+    async def _api_get(self, url: str, headers: Dict) -> Tuple[int, Optional[Dict]]:
+        """GET a Discord endpoint with bounded retries.
+
+        Rate limits honor Retry-After; 5xx responses and connection
+        errors back off exponentially. Without this a single transient
+        failure in a batch run marks a healthy bot invalid.
+        """
+        session = await self._get_session()
+
+        for attempt in range(_MAX_RETRIES):
+            try:
+                # The semaphore covers only the request itself so a slot
+                # is not wasted sleeping between retries
+                async with self._discord_sem:
+                    async with session.get(url, headers=headers) as response:
+                        if response.status == 429:
+                            delay = min(float(response.headers.get('Retry-After', 1)), 5)
+                        elif response.status >= 500:
+                            delay = 0.2 * 2 ** attempt
+                        else:
+                            body = await response.json() if response.status == 200 else None
+                            return response.status, body
+            except aiohttp.ClientConnectorError:
+                if attempt == _MAX_RETRIES - 1:
+                    raise
+                delay = 0.2 * 2 ** attempt
+
+            await asyncio.sleep(delay)
+
+        return response.status, None
+
+    async def _fetch_me(self, token: str) -> Tuple[int, Optional[Dict]]:
+        """Single /users/@me round-trip shared by validation and info.
+
+        The 200/401 decision and the bot payload come from the same
+        response, so callers never issue the request twice.
+        """
+        # Cached by token hash so batch validation hits Discord once per
+        # token instead of once per check
+        key = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+        cached = self._token_cache.get(key)
+        if cached and time.monotonic() - cached[0] < TOKEN_CACHE_TTL:
+            self._token_cache.move_to_end(key)
+            return cached[1], cached[2]
+
+        status, bot_info = await self._api_get(
+            f"{self.discord_api_base}/users/@me",
+            {'Authorization': f'Bot {token}'}
+        )
+
+        if status == 200:
+            self._token_cache[key] = (time.monotonic(), status, bot_info)
+            self._token_cache.move_to_end(key)
+            while len(self._token_cache) > TOKEN_CACHE_MAX:
+                self._token_cache.popitem(last=False)
+
+        return status, bot_info
+
     async def validate_token(self, token: str) -> bool:
         """Validate Discord bot token"""
         try:
@@ -18,27 +164,16 @@ class TokenValidator:
                 self.logger.error("Invalid token format")
                 return False
             
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'Authorization': f'Bot {token}',
-                    'Content-Type': 'application/json'
-                }
-                
-                async with session.get(
-                    f"{self.discord_api_base}/users/@me",
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 200:
-                        bot_info = await response.json()
-                        self.logger.info(f"Token validated for bot: {bot_info.get('username', 'Unknown')}")
-                        return True
-                    elif response.status == 401:
-                        self.logger.error("Invalid or expired token")
-                        return False
-                    else:
-                        self.logger.error(f"Token validation failed with status {response.status}")
-                        return False
+            status, bot_info = await self._fetch_me(token)
+            if status == 200:
+                self.logger.info(f"Token validated for bot: {bot_info.get('username', 'Unknown')}")
+                return True
+            elif status == 401:
+                self.logger.error("Invalid or expired token")
+                return False
+            else:
+                self.logger.error(f"Token validation failed with status {status}")
+                return False
                         
         except asyncio.TimeoutError:
             self.logger.error("Token validation timed out")
@@ -50,31 +185,19 @@ class TokenValidator:
     async def get_bot_info(self, token: str) -> Optional[Dict]:
         """Get bot information using token"""
         try:
-            if not await self.validate_token(token):
+            status, bot_info = await self._fetch_me(token)
+            if status != 200:
+                self.logger.error(f"Failed to get bot info (status {status})")
                 return None
-            
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'Authorization': f'Bot {token}',
-                    'Content-Type': 'application/json'
-                }
-                
-                async with session.get(
-                    f"{self.discord_api_base}/users/@me",
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 200:
-                        bot_info = await response.json()
-                        return {
-                            'id': bot_info.get('id'),
-                            'username': bot_info.get('username'),
-                            'discriminator': bot_info.get('discriminator'),
-                            'bot': bot_info.get('bot', False),
-                            'verified': bot_info.get('verified', False),
-                            'nitrix_validated': True
-                        }
-                    return None
+
+            return {
+                'id': bot_info.get('id'),
+                'username': bot_info.get('username'),
+                'discriminator': bot_info.get('discriminator'),
+                'bot': bot_info.get('bot', False),
+                'verified': bot_info.get('verified', False),
+                'nitrix_validated': True
+            }
                     
         except Exception as e:
             self.logger.error(f"Failed to get bot info: {e}")
@@ -98,32 +221,27 @@ class TokenValidator:
             if not guild_id:
                 return permissions_info
             
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'Authorization': f'Bot {token}',
-                    'Content-Type': 'application/json'
-                }
-                
-                # Check if bot is in guild
-                async with session.get(
-                    f"{self.discord_api_base}/guilds/{guild_id}/members/@me",
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 200:
-                        permissions_info['in_guild'] = True
-                        member_info = await response.json()
-                        
-                        # Get guild to check permissions
-                        async with session.get(
-                            f"{self.discord_api_base}/guilds/{guild_id}",
-                            headers=headers
-                        ) as guild_response:
-                            if guild_response.status == 200:
-                                guild_info = await guild_response.json()
-                                permissions_info['guild_name'] = guild_info.get('name')
-                                
-                        permissions_info['roles'] = member_info.get('roles', [])
+            headers = {'Authorization': f'Bot {token}'}
+
+            # The membership and guild lookups are independent, so they
+            # overlap instead of running back to back
+            (member_status, member_info), (guild_status, guild_info) = \
+                await asyncio.gather(
+                    self._api_get(
+                        f"{self.discord_api_base}/guilds/{guild_id}/members/@me",
+                        headers
+                    ),
+                    self._api_get(
+                        f"{self.discord_api_base}/guilds/{guild_id}",
+                        headers
+                    )
+                )
+
+            if member_status == 200:
+                permissions_info['in_guild'] = True
+                if guild_status == 200:
+                    permissions_info['guild_name'] = guild_info.get('name')
+                permissions_info['roles'] = member_info.get('roles', [])
             
             return permissions_info
             
@@ -136,51 +254,46 @@ class TokenValidator:
         if not token or not isinstance(token, str):
             return False
         
-        # Remove Bot prefix if present
-        token = token.replace('Bot ', '').strip()
-        
-        # Discord bot tokens are typically base64 encoded and have specific patterns
-        # Basic format check: should be alphanumeric with dots and underscores
-        pattern = r'^[A-Za-z0-9._-]+$'
-        
-        if not re.match(pattern, token):
-            return False
+        # Pasted tokens often carry a trailing newline; strip before
+        # the length/charset checks, then drop any Bot prefix
+        token = token.strip()
+        if token.startswith('Bot '):
+            token = token[4:].strip()
         
         # Length check (Discord tokens are usually 59+ characters)
-        if len(token) < 50:
+        if not 50 <= len(token) <= 128:
             return False
         
-        return True
+        # Set difference against the allowed charset beats a regex call
+        return not (set(token) - _TOKEN_CHARS)
 
     async def validate_config_file(self, config_path: Path) -> Tuple[bool, Dict]:
         """Validate bot configuration file"""
         try:
-            if not config_path.exists():
+            try:
+                config = await self._cached_parse_json(config_path)
+            except FileNotFoundError:
                 return False, {'error': 'Config file not found'}
             
-            import json
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-            
             validation_result = {
                 'valid': True,
                 'errors': [],
-                'warnings': []
+                'warnings': [],
+                'config': config
             }
             
-            # Required fields
-            required_fields = ['name', 'dockerfile', 'env_file']
-            for field in required_fields:
-                if field not in config:
-                    validation_result['errors'].append(f"Missing required field: {field}")
-                    validation_result['valid'] = False
+            # Required fields in one set difference
+            missing = self._REQUIRED_CONFIG.difference(config)
+            if missing:
+                validation_result['errors'].extend(
+                    f"Missing required field: {field}" for field in sorted(missing)
+                )
+                validation_result['valid'] = False
             
             # Optional field validation
-            if 'auto_restart' in config and not isinstance(config['auto_restart'], bool):
-                validation_result['warnings'].append("auto_restart should be boolean")
-            
-            if 'restart_on_crash' in config and not isinstance(config['restart_on_crash'], bool):
-                validation_result['warnings'].append("restart_on_crash should be boolean")
+            for field in self._BOOL_FIELDS:
+                if field in config and not isinstance(config[field], bool):
+                    validation_result['warnings'].append(f"{field} should be boolean")
             
             if 'webhook_url' in config:
                 webhook_url = config['webhook_url']
@@ -189,7 +302,7 @@ class TokenValidator:
             
             return validation_result['valid'], validation_result
             
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return False, {'error': 'Invalid JSON in config file'}
         except Exception as e:
             return False, {'error': f'Config validation error: {e}'}
@@ -197,41 +310,47 @@ class TokenValidator:
     async def validate_env_file(self, env_path: Path) -> Tuple[bool, Dict]:
         """Validate bot environment file"""
         try:
-            if not env_path.exists():
+            try:
+                text = await self._read_text_cached(env_path)
+            except FileNotFoundError:
                 return False, {'error': 'Environment file not found'}
             
             validation_result = {
                 'valid': True,
                 'errors': [],
                 'warnings': [],
-                'found_token': False
+                'found_token': False,
+                'bot_token': None
             }
             
-            with open(env_path, 'r') as f:
-                lines = f.readlines()
-            
-            for line_num, line in enumerate(lines, 1):
-                line = line.strip()
+            for line_num, raw in enumerate(text.splitlines(), 1):
+                line = raw.strip()
                 
-                if not line or line.startswith('#'):
+                if not line or line[0] == '#':
                     continue
                 
-                if '=' not in line:
+                key, sep, value = line.partition('=')
+                if not sep:
                     validation_result['warnings'].append(f"Line {line_num}: Invalid format, missing '='")
                     continue
                 
-                key, value = line.split('=', 1)
-                key = key.strip()
-                value = value.strip().strip('"\'')
+                # Only BOT_TOKEN needs its value; skip the strip/unquote
+                # churn for every other line
+                if key.strip() != 'BOT_TOKEN':
+                    continue
                 
-                if key == 'BOT_TOKEN':
-                    validation_result['found_token'] = True
-                    if not value or value == 'your_bot_token_here':
-                        validation_result['errors'].append("BOT_TOKEN is empty or placeholder")
-                        validation_result['valid'] = False
-                    elif not self._is_valid_token_format(value):
-                        validation_result['errors'].append("BOT_TOKEN has invalid format")
-                        validation_result['valid'] = False
+                value = value.strip()
+                if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+                    value = value[1:-1]
+                
+                validation_result['found_token'] = True
+                validation_result['bot_token'] = value or None
+                if not value or value == 'your_bot_token_here':
+                    validation_result['errors'].append("BOT_TOKEN is empty or placeholder")
+                    validation_result['valid'] = False
+                elif not self._is_valid_token_format(value):
+                    validation_result['errors'].append("BOT_TOKEN has invalid format")
+                    validation_result['valid'] = False
             
             if not validation_result['found_token']:
                 validation_result['errors'].append("BOT_TOKEN not found in environment file")
@@ -245,7 +364,9 @@ class TokenValidator:
     async def validate_dockerfile(self, dockerfile_path: Path) -> Tuple[bool, Dict]:
         """Validate Dockerfile"""
         try:
-            if not dockerfile_path.exists():
+            try:
+                content = await self._read_text_cached(dockerfile_path)
+            except FileNotFoundError:
                 return False, {'error': 'Dockerfile not found'}
             
             validation_result = {
@@ -258,27 +379,31 @@ class TokenValidator:
                 'has_cmd': False
             }
             
-            with open(dockerfile_path, 'r') as f:
-                content = f.read().upper()
+            # One pass over the instruction tokens; unlike a substring
+            # scan this ignores comments and RUN command bodies
+            instructions = set()
+            for raw in content.splitlines():
+                line = raw.lstrip()
+                if line and not line.startswith('#'):
+                    instructions.add(line.split(None, 1)[0].upper())
             
-            # Check for essential Dockerfile instructions
-            if 'FROM' in content:
+            if 'FROM' in instructions:
                 validation_result['has_from'] = True
             else:
                 validation_result['errors'].append("Missing FROM instruction")
                 validation_result['valid'] = False
             
-            if 'WORKDIR' in content:
+            if 'WORKDIR' in instructions:
                 validation_result['has_workdir'] = True
             else:
                 validation_result['warnings'].append("Missing WORKDIR instruction (recommended)")
             
-            if 'COPY' in content or 'ADD' in content:
+            if instructions & {'COPY', 'ADD'}:
                 validation_result['has_copy'] = True
             else:
                 validation_result['warnings'].append("No COPY/ADD instructions found")
             
-            if 'CMD' in content or 'ENTRYPOINT' in content:
+            if instructions & {'CMD', 'ENTRYPOINT'}:
                 validation_result['has_cmd'] = True
             else:
                 validation_result['errors'].append("Missing CMD or ENTRYPOINT instruction")
@@ -294,9 +419,7 @@ class TokenValidator:
         if not url:
             return False
         
-        # Discord webhook URL pattern
-        webhook_pattern = r'https://discord(?:app)?\.com/api/webhooks/\d+/[\w-]+'
-        return re.match(webhook_pattern, url) is not None
+        return _WEBHOOK_RE.match(url) is not None
 
     async def validate_bot_setup(self, bot_name: str) -> Dict:
         """Comprehensive bot setup validation"""
@@ -320,7 +443,7 @@ class TokenValidator:
                 validation_result['overall_valid'] = False
                 return validation_result
             
-            # Validate config file
+            # Validate config file first since it names the other files
             config_path = bot_dir / 'config.json'
             config_valid, config_result = await self.validate_config_file(config_path)
             validation_result['config_valid'] = config_valid
@@ -331,46 +454,50 @@ class TokenValidator:
             
             validation_result['warnings'].extend(config_result.get('warnings', []))
             
-            # Load config for further validation
-            config = {}
-            if config_valid:
-                with open(config_path, 'r') as f:
-                    config = json.load(f)
+            # The parsed config rides along in the validation result
+            config = config_result.get('config', {}) if config_valid else {}
             
-            # Validate environment file
-            env_file = config.get('env_file', 'env')
-            env_path = bot_dir / env_file
-            env_valid, env_result = await self.validate_env_file(env_path)
+            env_path = bot_dir / config.get('env_file', 'env')
+            dockerfile_path = bot_dir / config.get('dockerfile', 'dockerfile')
+
+            async def _check_env_and_token():
+                # The token check depends on the env file, so the two run
+                # as one chain that overlaps with the dockerfile check
+                env_valid, env_result = await self.validate_env_file(env_path)
+                token_checked = token_valid = False
+                if env_valid and env_result.get('found_token'):
+                    # The env pass already captured the token value
+                    token = env_result.get('bot_token')
+                    if token:
+                        token_checked = True
+                        token_valid = await self.validate_token(token)
+                return env_valid, env_result, token_checked, token_valid
+
+            (env_valid, env_result, token_checked, token_valid), \
+                (dockerfile_valid, dockerfile_result) = await asyncio.gather(
+                    _check_env_and_token(),
+                    self.validate_dockerfile(dockerfile_path)
+                )
+
             validation_result['env_valid'] = env_valid
-            
             if not env_valid:
                 validation_result['errors'].extend(env_result.get('errors', []))
                 validation_result['overall_valid'] = False
             
             validation_result['warnings'].extend(env_result.get('warnings', []))
             
-            # Validate Dockerfile
-            dockerfile = config.get('dockerfile', 'dockerfile')
-            dockerfile_path = bot_dir / dockerfile
-            dockerfile_valid, dockerfile_result = await self.validate_dockerfile(dockerfile_path)
             validation_result['dockerfile_valid'] = dockerfile_valid
-            
             if not dockerfile_valid:
                 validation_result['errors'].extend(dockerfile_result.get('errors', []))
                 validation_result['overall_valid'] = False
             
             validation_result['warnings'].extend(dockerfile_result.get('warnings', []))
             
-            # Validate token if environment is valid
-            if env_valid and env_result.get('found_token'):
-                token = self._extract_token_from_env_file(env_path)
-                if token:
-                    token_valid = await self.validate_token(token)
-                    validation_result['token_valid'] = token_valid
-                    
-                    if not token_valid:
-                        validation_result['errors'].append("Bot token validation failed")
-                        validation_result['overall_valid'] = False
+            if token_checked:
+                validation_result['token_valid'] = token_valid
+                if not token_valid:
+                    validation_result['errors'].append("Bot token validation failed")
+                    validation_result['overall_valid'] = False
             
             self.logger.info(f"Bot setup validation for {bot_name}: {'PASSED' if validation_result['overall_valid'] else 'FAILED'}")
             
@@ -384,19 +511,6 @@ class TokenValidator:
                 'error': str(e)
             }
 
-    def _extract_token_from_env_file(self, env_path: Path) -> Optional[str]:
-        """Extract bot token from environment file"""
-        try:
-            with open(env_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('BOT_TOKEN='):
-                        return line.split('=', 1)[1].strip().strip('"\'')
-            return None
-        except Exception as e:
-            self.logger.error(f"Failed to extract token from {env_path}: {e}")
-            return None
-
     async def batch_validate_bots(self) -> Dict:
         """Validate all bots in the bots directory"""
         try:
@@ -417,28 +531,46 @@ class TokenValidator:
                 }
             }
             
-            for bot_dir in bots_dir.iterdir():
-                if bot_dir.is_dir():
-                    bot_name = bot_dir.name
-                    results['total_bots'] += 1
-                    
-                    validation = await self.validate_bot_setup(bot_name)
-                    results['bot_results'][bot_name] = validation
+            # scandir reads the directory type from the dirent, so this
+            # avoids a stat per entry
+            with os.scandir(bots_dir) as it:
+                bot_names = [e.name for e in it if e.is_dir()]
+            results['total_bots'] = len(bot_names)
+
+            # Validations are pure I/O, so they run concurrently; the
+            # semaphore keeps us under Discord's per-route rate limits
+            sem = asyncio.Semaphore(16)
+
+            async def _validate_one(name):
+                async with sem:
+                    return name, await self.validate_bot_setup(name)
+
+            for outcome in await asyncio.gather(
+                *(_validate_one(name) for name in bot_names),
+                return_exceptions=True
+            ):
+                if isinstance(outcome, Exception):
+                    self.logger.error(f"Batch validation task failed: {outcome}")
+                    results['invalid_bots'] += 1
+                    continue
+
+                bot_name, validation = outcome
+                results['bot_results'][bot_name] = validation
+
+                if validation['overall_valid']:
+                    results['valid_bots'] += 1
+                else:
+                    results['invalid_bots'] += 1
                     
-                    if validation['overall_valid']:
-                        results['valid_bots'] += 1
-                    else:
-                        results['invalid_bots'] += 1
-                        
-                        # Count specific issue types
-                        if not validation.get('config_valid', True):
-                            results['summary']['config_issues'] += 1
-                        if not validation.get('env_valid', True):
-                            results['summary']['env_issues'] += 1
-                        if not validation.get('dockerfile_valid', True):
-                            results['summary']['dockerfile_issues'] += 1
-                        if not validation.get('token_valid', True):
-                            results['summary']['token_issues'] += 1
+                    # Count specific issue types
+                    if not validation.get('config_valid', True):
+                        results['summary']['config_issues'] += 1
+                    if not validation.get('env_valid', True):
+                        results['summary']['env_issues'] += 1
+                    if not validation.get('dockerfile_valid', True):
+                        results['summary']['dockerfile_issues'] += 1
+                    if not validation.get('token_valid', True):
+                        results['summary']['token_issues'] += 1
             
             return results
             
@@ -1,110 +1,299 @@
 import aiohttp
 import asyncio
-import json
+import functools
+import orjson
+import random
+import time
+from collections import deque
 from datetime import datetime
+from types import MappingProxyType
 from typing import Optional, Dict
 from pathlib import Path
 
 from utils.logger import get_logger
 
+_NITRIX_SIG = "t10-bot-manager"
+_TS_FMT = '%Y-%m-%d %H:%M:%S UTC'
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+@functools.lru_cache(maxsize=4)
+def _fmt_ts(epoch_sec: int) -> str:
+    """Embed timestamp for a whole second, memoized for bursts.
+
+    Uses gmtime so the label actually matches the UTC suffix.
+    """
+    return time.strftime(_TS_FMT, time.gmtime(epoch_sec))
+
+# Embed constants built once at import; the hot notification path only
+# does read-only lookups, and the proxies keep callers from mutating
+# the shared maps
+_STATUS_COLORS = MappingProxyType({
+    'started': 0x00ff00,  # Green
+    'stopped': 0xffff00,  # Yellow
+    'crashed': 0xff0000,  # Red
+    'restarted': 0x0099ff  # Blue
+})
+
+_STATUS_EMOJIS = MappingProxyType({
+    'started': '🚀',
+    'stopped': '⏹️',
+    'crashed': '💥',
+    'restarted': '🔄'
+})
+
+_SEVERITY_COLORS = MappingProxyType({
+    'info': 0x0099ff,
+    'warning': 0xffaa00,
+    'error': 0xff0000,
+    'critical': 0x990000
+})
+
+_SEVERITY_EMOJIS = MappingProxyType({
+    'info': 'ℹ️',
+    'warning': '⚠️',
+    'error': '❌',
+    'critical': '🚨'
+})
+
+_FOOTER_MANAGED = {'text': f'Managed by {_NITRIX_SIG}'}
+_FOOTER_MONITOR = {'text': 'Nitrix t10 System Monitor'}
+_FOOTER_CRASH = {'text': f'Auto-restart enabled | {_NITRIX_SIG}'}
+_FOOTER_VERSION = {'text': f'{_NITRIX_SIG} v1.0.0'}
+_FOOTER_POWERED = {'text': f'Powered by {_NITRIX_SIG}'}
+
+# (all_running, none_running) -> (status label, embed color)
+_HEALTH_STATUSES = MappingProxyType({
+    (True, False): ('🟢 Healthy', 0x00ff00),
+    (False, False): ('🟡 Partial', 0xffaa00),
+    (False, True): ('🔴 Critical', 0xffaa00)
+})
+
+
+def _detail_fields(details: Optional[Dict]):
+    """Expand extra detail entries into inline embed fields"""
+    if not details:
+        return ()
+    return ({'name': key.replace('_', ' ').title(), 'value': str(value), 'inline': True}
+            for key, value in details.items())
+
+# Delivery retry policy: exponential backoff with jitter, capped, and
+# only for failure classes where a retry can actually help
+MAX_RETRIES = 5
+BASE_DELAY = 1.0
+MAX_DELAY = 32.0
+_RETRYABLE_STATUSES = frozenset({500, 502, 503, 504})
+
+# Sliding-window rate limiting: a fixed ring of 10s buckets per webhook
+# URL covers a 60s window, so bursts and sustained traffic are both
+# counted accurately instead of gating on a single last-request stamp
+_BUCKET_SECONDS = 10
+_BUCKET_COUNT = 6
+_WINDOW_LIMIT = 30  # Discord allows 30 webhook requests per minute
+
+# Eviction policy for per-URL window state: one periodic sweep drops
+# entries idle longer than the TTL, and a hard cap bounds worst-case
+# memory when webhooks rotate faster than the sweep runs
+_SWEEP_INTERVAL = 60
+_ENTRY_TTL = 300
+_MAX_ENTRIES = 10_000
+
+# Notifications to the same webhook inside this window are merged into
+# one post; Discord accepts up to 10 embeds per message
+_COALESCE_WINDOW = 0.5
+_MAX_BATCH_EMBEDS = 10
+
 class WebhookNotifier:
     def __init__(self):
         self.logger = get_logger('webhook')
-        self.rate_limits = {}
-        self.nitrix_signature = "t10-bot-manager"
+        self._buckets: Dict[str, Dict] = {}  # webhook_url -> sliding window state
+        self._global_pause_until = 0.0  # monotonic deadline from a global 429
+        self.nitrix_signature = _NITRIX_SIG
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._sweep_task: Optional[asyncio.Task] = None
+        self._pending: Dict[str, list] = {}  # webhook_url -> queued notifications
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+        self._failed = deque(maxlen=1000)  # dead-lettered payloads
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily build one pooled session for all webhook posts.
+
+        Keep-alive connections to Discord drop the per-notification
+        TCP+TLS handshake; the dummy cookie jar keeps cookies from
+        leaking between different webhooks.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(
+                    limit=50,
+                    limit_per_host=20,
+                    ttl_dns_cache=600,
+                    keepalive_timeout=120,
+                    enable_cleanup_closed=True,
+                    force_close=False
+                ),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                raise_for_status=False,
+                skip_auto_headers={'User-Agent'},
+                headers={'User-Agent': f'{_NITRIX_SIG}/1.0'}
+            )
+        if self._sweep_task is None or self._sweep_task.done():
+            # Started here rather than __init__ so a loop is guaranteed
+            self._sweep_task = asyncio.create_task(self._sweep())
+        return self._session
+
+    async def aclose(self):
+        """Close the shared session (application shutdown)"""
+        if self._sweep_task is not None:
+            self._sweep_task.cancel()
+            self._sweep_task = None
+        for task in self._flush_tasks.values():
+            task.cancel()
+        self._flush_tasks.clear()
+        # Resolve anything still queued so awaiting callers don't hang
+        for queued in self._pending.values():
+            for _, _, future in queued:
+                if not future.done():
+                    future.set_result(False)
+        self._pending.clear()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
         
     async def send_notification(self, webhook_url: str, message: str, 
                                notification_type: str = "info", 
                                embed: Optional[Dict] = None) -> bool:
-        """Send notification to Discord webhook"""
+        """Send notification to Discord webhook.
+
+        Notifications for the same webhook arriving within the coalesce
+        window are merged into one multi-embed post, so a crash storm
+        costs one request against the Discord quota instead of ten.
+        """
         try:
             if not webhook_url:
                 return False
             
             # Rate limiting check
-            if await self._is_rate_limited(webhook_url):
+            if self._is_rate_limited(webhook_url):
                 self.logger.warning(f"Webhook rate limited: {webhook_url}")
                 return False
             
-            payload = await self._create_payload(message, notification_type, embed)
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    webhook_url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 204:
-                        self.logger.info("Webhook notification sent successfully")
-                        await self._update_rate_limit(webhook_url)
-                        return True
-                    elif response.status == 429:
-                        self.logger.warning("Webhook rate limited by Discord")
-                        await self._handle_rate_limit(webhook_url, response)
-                        return False
-                    else:
-                        self.logger.error(f"Webhook failed with status {response.status}")
-                        return False
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending.setdefault(webhook_url, []).append((message, embed, future))
+
+            task = self._flush_tasks.get(webhook_url)
+            if task is None or task.done():
+                self._flush_tasks[webhook_url] = loop.create_task(
+                    self._flush_after(webhook_url))
+
+            return await future
                         
-        except asyncio.TimeoutError:
-            self.logger.error("Webhook request timed out")
-            return False
         except Exception as e:
             self.logger.error(f"Webhook error: {e}")
             return False
 
+    async def _flush_after(self, webhook_url: str):
+        """Drain the queue for a URL in batches after the coalesce window"""
+        await asyncio.sleep(_COALESCE_WINDOW)
+
+        while queued := self._pending.get(webhook_url):
+            batch = queued[:_MAX_BATCH_EMBEDS]
+            del queued[:_MAX_BATCH_EMBEDS]
+            if not queued:
+                self._pending.pop(webhook_url, None)
+
+            success = await self._post_batch(webhook_url, batch)
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result(success)
+
+        self._flush_tasks.pop(webhook_url, None)
+
+    async def _post_batch(self, webhook_url: str, batch: list) -> bool:
+        """Post one coalesced payload with retries"""
+        try:
+            payload = self._create_payload(
+                '\n'.join(message for message, _, _ in batch)[:2000],
+                [embed for _, embed, _ in batch if embed]
+            )
+            # Serialize once up front with orjson; json= would re-encode
+            # through stdlib json on every retry
+            data = orjson.dumps(payload)
+            
+            session = await self._get_session()
+
+            for attempt in range(MAX_RETRIES):
+                delay = min(BASE_DELAY * (2 ** attempt) + random.uniform(0, 0.5),
+                            MAX_DELAY)
+                try:
+                    async with session.post(webhook_url, data=data,
+                                             headers=_JSON_HEADERS) as response:
+                        if response.status == 204:
+                            self.logger.info("Webhook notification sent successfully")
+                            self._update_rate_limit(webhook_url)
+                            self._note_bucket_headers(webhook_url, response.headers)
+                            return True
+                        elif response.status == 429:
+                            self.logger.warning("Webhook rate limited by Discord")
+                            retry_after = await self._handle_rate_limit(webhook_url, response)
+                            if retry_after:
+                                delay = min(retry_after, MAX_DELAY)
+                        elif response.status in _RETRYABLE_STATUSES:
+                            self.logger.warning(f"Webhook failed with status {response.status}, retrying")
+                        else:
+                            # Other 4xx responses will fail identically on
+                            # retry, so give up immediately
+                            self.logger.error(f"Webhook failed with status {response.status}")
+                            return False
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    self.logger.warning(f"Webhook attempt {attempt + 1} failed: {e}")
+
+                if attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(delay)
+
+            # Delivery failed for good; keep the payload for inspection
+            self._failed.append({
+                'webhook_url': webhook_url,
+                'payload': payload,
+                'failed_at': time.time()
+            })
+            self.logger.error(f"Webhook undelivered after {MAX_RETRIES} attempts")
+            return False
+                        
+        except Exception as e:
+            self.logger.error(f"Webhook batch error: {e}")
+            return False
+
+    def get_failed_webhooks(self) -> list:
+        """Payloads that exhausted their delivery retries"""
+        return list(self._failed)
+
     async def send_bot_status(self, webhook_url: str, bot_name: str, 
                              status: str, details: Optional[Dict] = None) -> bool:
         """Send bot status update via webhook"""
         try:
-            color_map = {
-                'started': 0x00ff00,  # Green
-                'stopped': 0xffff00,  # Yellow
-                'crashed': 0xff0000,  # Red
-                'restarted': 0x0099ff  # Blue
-            }
-            
+            # One literal: the field list is built in a single pass
+            # instead of append calls per detail entry
             embed = {
                 'title': f'Bot Status Update',
-                'color': color_map.get(status, 0x808080),
+                'color': _STATUS_COLORS.get(status, 0x808080),
                 'fields': [
-                    {
-                        'name': 'Bot Name',
-                        'value': bot_name,
-                        'inline': True
-                    },
-                    {
-                        'name': 'Status',
-                        'value': status.title(),
-                        'inline': True
-                    },
-                    {
-                        'name': 'Timestamp',
-                        'value': datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
-                        'inline': True
-                    }
+                    {'name': 'Bot Name', 'value': bot_name, 'inline': True},
+                    {'name': 'Status', 'value': status.title(), 'inline': True},
+                    {'name': 'Timestamp', 'value': _fmt_ts(int(time.time())), 'inline': True},
+                    *_detail_fields(details)
                 ],
-                'footer': {
-                    'text': f'Managed by {self.nitrix_signature}'
-                }
-            }
-            
-            if details:
-                for key, value in details.items():
-                    embed['fields'].append({
-                        'name': key.replace('_', ' ').title(),
-                        'value': str(value),
-                        'inline': True
-                    })
-            
-            status_emojis = {
-                'started': '🚀',
-                'stopped': '⏹️',
-                'crashed': '💥',
-                'restarted': '🔄'
+                'footer': _FOOTER_MANAGED
             }
             
-            message = f"{status_emojis.get(status, '📊')} Bot **{bot_name}** {status}"
+            message = f"{_STATUS_EMOJIS.get(status, '📊')} Bot **{bot_name}** {status}"
             
             return await self.send_notification(webhook_url, message, status, embed)
             
@@ -116,24 +305,10 @@ class WebhookNotifier:
                                message: str, severity: str = "warning") -> bool:
         """Send system alert via webhook"""
         try:
-            severity_colors = {
-                'info': 0x0099ff,
-                'warning': 0xffaa00,
-                'error': 0xff0000,
-                'critical': 0x990000
-            }
-            
-            severity_emojis = {
-                'info': 'ℹ️',
-                'warning': '⚠️',
-                'error': '❌',
-                'critical': '🚨'
-            }
-            
             embed = {
-                'title': f'{severity_emojis.get(severity, "🔔")} System Alert',
+                'title': f'{_SEVERITY_EMOJIS.get(severity, "🔔")} System Alert',
                 'description': message,
-                'color': severity_colors.get(severity, 0x808080),
+                'color': _SEVERITY_COLORS.get(severity, 0x808080),
                 'fields': [
                     {
                         'name': 'Alert Type',
@@ -147,16 +322,14 @@ class WebhookNotifier:
                     },
                     {
                         'name': 'Time',
-                        'value': datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
+                        'value': _fmt_ts(int(time.time())),
                         'inline': True
                     }
                 ],
-                'footer': {
-                    'text': f'Nitrix t10 System Monitor'
-                }
+                'footer': _FOOTER_MONITOR
             }
             
-            alert_message = f"{severity_emojis.get(severity, '🔔')} **{alert_type}**: {message}"
+            alert_message = f"{_SEVERITY_EMOJIS.get(severity, '🔔')} **{alert_type}**: {message}"
             
             return await self.send_notification(webhook_url, alert_message, severity, embed)
             
@@ -184,7 +357,7 @@ class WebhookNotifier:
                     },
                     {
                         'name': 'Crash Time',
-                        'value': datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
+                        'value': _fmt_ts(int(time.time())),
                         'inline': True
                     },
                     {
@@ -193,9 +366,7 @@ class WebhookNotifier:
                         'inline': False
                     }
                 ],
-                'footer': {
-                    'text': f'Auto-restart enabled | {self.nitrix_signature}'
-                }
+                'footer': _FOOTER_CRASH
             }
             
             message = f"🚨 Bot **{bot_name}** has crashed and is being restarted (attempt #{attempt_count})"
@@ -212,49 +383,28 @@ class WebhookNotifier:
             total_bots = health_data.get('total_bots', 0)
             running_bots = health_data.get('running_bots', 0)
             
-            health_status = "🟢 Healthy" if running_bots == total_bots else "🟡 Partial"
-            if running_bots == 0 and total_bots > 0:
-                health_status = "🔴 Critical"
+            all_running = running_bots == total_bots
+            none_running = running_bots == 0 and total_bots > 0
+            health_status, color = _HEALTH_STATUSES[(all_running, none_running)]
             
             embed = {
                 'title': '📊 System Health Report',
-                'color': 0x00ff00 if running_bots == total_bots else 0xffaa00,
+                'color': color,
                 'fields': [
-                    {
-                        'name': 'System Status',
-                        'value': health_status,
-                        'inline': True
-                    },
-                    {
-                        'name': 'Total Bots',
-                        'value': str(total_bots),
-                        'inline': True
-                    },
-                    {
-                        'name': 'Running Bots',
-                        'value': str(running_bots),
-                        'inline': True
-                    },
-                    {
-                        'name': 'Uptime',
-                        'value': health_data.get('uptime', 'Unknown'),
-                        'inline': True
-                    },
-                    {
-                        'name': 'Memory Usage',
-                        'value': f"{health_data.get('memory_percent', 0):.1f}%",
-                        'inline': True
-                    },
-                    {
-                        'name': 'CPU Usage',
-                        'value': f"{health_data.get('cpu_percent', 0):.1f}%",
-                        'inline': True
-                    }
+                    {'name': 'System Status', 'value': health_status, 'inline': True},
+                    {'name': 'Total Bots', 'value': f'{total_bots}', 'inline': True},
+                    {'name': 'Running Bots', 'value': f'{running_bots}', 'inline': True},
+                    {'name': 'Uptime', 'value': health_data.get('uptime', 'Unknown'), 'inline': True},
+                    {'name': 'Memory Usage',
+                     'value': f"{health_data.get('memory_percent', 0):.1f}%",
+                     'inline': True},
+                    {'name': 'CPU Usage',
+                     'value': f"{health_data.get('cpu_percent', 0):.1f}%",
+                     'inline': True}
                 ],
-                'timestamp': datetime.now().isoformat(),
-                'footer': {
-                    'text': f'{self.nitrix_signature} v1.0.0'
-                }
+                # orjson renders datetime as ISO 8601 natively
+                'timestamp': datetime.now(),
+                'footer': _FOOTER_VERSION
             }
             
             message = f"📊 System health check complete - {health_status}"
@@ -265,58 +415,119 @@ class WebhookNotifier:
             self.logger.error(f"Failed to send health report: {e}")
             return False
 
-    async def _create_payload(self, message: str, notification_type: str, 
-                             embed: Optional[Dict] = None) -> Dict:
+    def _create_payload(self, content: str, embeds: list) -> Dict:
         """Create webhook payload"""
         payload = {
-            'content': message,
+            'content': content,
             'username': 't10 Bot Manager',
             'avatar_url': None  # Could add a custom avatar URL here
         }
         
-        if embed:
-            payload['embeds'] = [embed]
+        if embeds:
+            payload['embeds'] = embeds
         
         return payload
 
-    async def _is_rate_limited(self, webhook_url: str) -> bool:
+    def _bucket_state(self, webhook_url: str) -> Dict:
+        """Fetch the sliding window for a URL, rotating aged buckets out.
+
+        Uses time.monotonic() so wall-clock jumps cannot stall or reset
+        the window; rotation is O(1) via the deque maxlen.
+        """
+        idx = int(time.monotonic() // _BUCKET_SECONDS)
+        state = self._buckets.get(webhook_url)
+
+        if state is None:
+            if len(self._buckets) >= _MAX_ENTRIES:
+                # Hard cap between sweeps: drop the longest-idle URL
+                coldest = min(self._buckets, key=lambda k: self._buckets[k]['last_access'])
+                del self._buckets[coldest]
+            state = {
+                'idx': idx,
+                'counts': deque([0] * _BUCKET_COUNT, maxlen=_BUCKET_COUNT),
+                'blocked_until': 0.0
+            }
+            self._buckets[webhook_url] = state
+        elif idx != state['idx']:
+            steps = min(idx - state['idx'], _BUCKET_COUNT)
+            state['counts'].extend([0] * steps)
+            state['idx'] = idx
+
+        state['last_access'] = time.monotonic()
+        return state
+
+    async def _sweep(self):
+        """Periodically drop window state for webhooks no longer in use.
+
+        One interval task for the whole map keeps memory bounded for
+        long-running managers without per-entry timers.
+        """
+        while True:
+            await asyncio.sleep(_SWEEP_INTERVAL)
+            try:
+                cutoff = time.monotonic() - _ENTRY_TTL
+                stale = [url for url, state in self._buckets.items()
+                         if state['last_access'] < cutoff]
+                for url in stale:
+                    del self._buckets[url]
+            except Exception as e:
+                self.logger.error(f"Rate limit sweep failed: {e}")
+
+    def _is_rate_limited(self, webhook_url: str) -> bool:
         """Check if webhook is rate limited"""
-        try:
-            if webhook_url not in self.rate_limits:
-                return False
-            
-            last_request = self.rate_limits[webhook_url]['last_request']
-            min_interval = self.rate_limits[webhook_url].get('min_interval', 5)
-            
-            return (datetime.now().timestamp() - last_request) < min_interval
-            
-        except Exception:
-            return False
+        if time.monotonic() < self._global_pause_until:
+            return True
 
-    async def _update_rate_limit(self, webhook_url: str):
-        """Update rate limit information"""
-        try:
-            if webhook_url not in self.rate_limits:
-                self.rate_limits[webhook_url] = {}
-            
-            self.rate_limits[webhook_url]['last_request'] = datetime.now().timestamp()
-            
-        except Exception as e:
-            self.logger.error(f"Failed to update rate limit: {e}")
+        state = self._bucket_state(webhook_url)
+
+        if time.monotonic() < state['blocked_until']:
+            return True
+
+        return sum(state['counts']) >= _WINDOW_LIMIT
 
-    async def _handle_rate_limit(self, webhook_url: str, response):
-        """Handle Discord rate limit response"""
+    def _update_rate_limit(self, webhook_url: str):
+        """Count a delivered request in the current window bucket"""
+        self._bucket_state(webhook_url)['counts'][-1] += 1
+
+    def _note_bucket_headers(self, webhook_url: str, headers):
+        """Pause a URL preemptively when Discord says its bucket is spent"""
+        if headers.get('X-RateLimit-Remaining') == '0':
+            reset_after = float(headers.get('X-RateLimit-Reset-After', 1))
+            state = self._bucket_state(webhook_url)
+            state['blocked_until'] = time.monotonic() + reset_after
+
+    async def _handle_rate_limit(self, webhook_url: str, response) -> Optional[float]:
+        """Handle Discord rate limit response.
+
+        The 429 body carries retry_after with millisecond precision and
+        a global flag; the integer retry-after header is only the
+        fallback. Returns the delay so the caller can sleep exactly
+        that long.
+        """
         try:
-            if 'retry-after' in response.headers:
-                retry_after = int(response.headers['retry-after'])
-                if webhook_url not in self.rate_limits:
-                    self.rate_limits[webhook_url] = {}
-                
-                self.rate_limits[webhook_url]['min_interval'] = retry_after
-                self.logger.warning(f"Rate limited for {retry_after} seconds")
+            retry_after = float(response.headers.get('retry-after', 1))
+            is_global = False
+            try:
+                body = await response.json(loads=orjson.loads)
+                retry_after = float(body.get('retry_after', retry_after))
+                is_global = bool(body.get('global'))
+            except Exception:
+                pass  # no JSON body; the header value stands
+
+            until = time.monotonic() + retry_after
+            if is_global:
+                # A global limit applies to every webhook, not just this one
+                self._global_pause_until = until
+                self.logger.warning(f"Globally rate limited for {retry_after:.2f} seconds")
+            else:
+                self._bucket_state(webhook_url)['blocked_until'] = until
+                self.logger.warning(f"Rate limited for {retry_after:.2f} seconds")
+
+            return retry_after
                 
         except Exception as e:
             self.logger.error(f"Failed to handle rate limit: {e}")
+            return None
 
     async def test_webhook(self, webhook_url: str) -> Dict:
         """Test webhook connectivity"""
@@ -333,13 +544,11 @@ class WebhookNotifier:
                     },
                     {
                         'name': 'Timestamp',
-                        'value': datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
+                        'value': _fmt_ts(int(time.time())),
                         'inline': True
                     }
                 ],
-                'footer': {
-                    'text': f'Powered by {self.nitrix_signature}'
-                }
+                'footer': _FOOTER_POWERED
             }
             
             success = await self.send_notification(
@@ -367,8 +576,11 @@ class WebhookNotifier:
         """Get webhook usage statistics"""
         try:
             return {
-                'total_webhooks': len(self.rate_limits),
-                'rate_limits': self.rate_limits,
+                'total_webhooks': len(self._buckets),
+                'requests_last_minute': {
+                    url: sum(state['counts'])
+                    for url, state in self._buckets.items()
+                },
                 'nitrix_managed': True
             }
         except Exception as e: